@@ -0,0 +1,12 @@
+import os
+
+# Opt-in: event loops created after the agent package is imported use uvloop, when it is installed
+if os.environ.get("COQPILOT_AGENT_USE_UVLOOP"):
+    try:
+        import asyncio
+
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
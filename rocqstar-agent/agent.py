@@ -1,65 +1,133 @@
 import asyncio
-import json
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Any, List, TypedDict, Literal, Optional, Dict, Callable
+import os
+import queue
+import re
+import warnings
+from collections import OrderedDict
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, List, TypedDict, Literal, Optional, Dict, Callable, Tuple
 from datetime import datetime
 
 from ideformer.agents.coqpilot_agent.planning.simple import simple_plan_generation
+import orjson
 import structlog
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, BaseMessage
+from langchain_core.messages import (
+    HumanMessage, SystemMessage, AIMessage, AIMessageChunk, BaseMessage, ToolCall, message_chunk_to_message
+)
 from langchain_core.tools import BaseTool
 from langgraph.graph import START, StateGraph, END
-from langgraph.prebuilt import ToolNode
+from langgraph.graph.state import CompiledStateGraph
+from langgraph.prebuilt.tool_node import INVALID_TOOL_NAME_ERROR_TEMPLATE, TOOL_CALL_ERROR_TEMPLATE
 from langchain_core.messages import ToolMessage
 
 from grazie_langchain_utils.language_models.grazie import ChatGrazie
 from ideformer.agents.coqpilot_agent.coq_project_client import CoqProjectClient
-from ideformer.agents.coqpilot_agent.prompt import execution_system_prompt
+from ideformer.agents.coqpilot_agent.prompt import render_execution_prompt
 from ideformer.agents.coqpilot_agent.protocol import (
     CoqPilotGeneralMessageE2SContent,
     CoqPilotGeneralMessageS2EContent, CoqPilotGeneralMessageE2SConfig
 )
 from ideformer.core.agent import IdeFormerAgent, S2EContentT
 from .mcp_client import McpHttpClient
-from .tools import McpCoqTool, McpCoqToolProvider
-from .planning.mad import multi_agent_proof_debate
+from .tools import McpCoqToolProvider, summarize_tools
+from .planning.mad import run_debate_samples
 from ...core.protocol.types import ALLOWED_ARG_TYPES
 
 # Global configuration for logging
-TIMESTAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
-LOG_FILE_PATH = f"coqpilot_agent_{TIMESTAMP}.log"
 MAX_LOG_SIZE_MB = 10
 MAX_LOG_FILES = 5
 
-# Configure file handler
-file_handler = RotatingFileHandler(
-    LOG_FILE_PATH,
-    maxBytes=MAX_LOG_SIZE_MB * 1024 * 1024,
-    backupCount=MAX_LOG_FILES
-)
 
-# Configure structlog
-structlog.configure(
-    processors=[
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer()
-    ],
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+def resolve_log_level(level_name: str) -> int:
+    """
+    Resolve a logging level name, e.g. "DEBUG", falling back to INFO with a warning for unknown names.
+
+    :param level_name:  Case-insensitive level name.
+    :returns:           The numeric logging level.
+    """
+    level = logging.getLevelName(level_name.upper())
+    if isinstance(level, int):
+        return level
+    warnings.warn(f"Unknown COQPILOT_AGENT_LOG_LEVEL {level_name!r}, logging at INFO")
+    return logging.INFO
+
+
+# Full LLM/tool payloads are logged at INFO, set COQPILOT_AGENT_LOG_LEVEL=WARNING to drop them
+LOG_LEVEL = resolve_log_level(os.environ.get("COQPILOT_AGENT_LOG_LEVEL", "INFO"))
+# Payload logs are guarded with this, so that their arguments are not even built when INFO is filtered out
+LOG_PAYLOADS = LOG_LEVEL <= logging.INFO
+
+# Agent records go to a dedicated stdlib logger, leaving the host process's root logger untouched
+AGENT_LOGGER_NAME = "coqpilot_agent"
+
+logger = structlog.get_logger(AGENT_LOGGER_NAME)
+queue_listener: Optional[QueueListener] = None
+
+
+def init_logging() -> None:
+    """
+    Configure file logging once the agent starts, so that importing this module opens no files.
+
+    Records are only enqueued on the event loop; serialization to disk and rotation happen on the listener thread.
+    The log file is taken from COQPILOT_AGENT_LOG_FILE_PATH (a timestamped file by default),
+    set it to /dev/null to disable file logging entirely.
+    """
+    global queue_listener
+    if queue_listener is not None:
+        return
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file_path = os.environ.get("COQPILOT_AGENT_LOG_FILE_PATH", f"coqpilot_agent_{timestamp}.log")
+    if log_file_path == os.devnull:
+        file_handler = logging.NullHandler()
+    else:
+        file_handler = RotatingFileHandler(
+            log_file_path,
+            maxBytes=MAX_LOG_SIZE_MB * 1024 * 1024,
+            backupCount=MAX_LOG_FILES
+        )
+
+    log_queue = queue.Queue(-1)
+    queue_listener = QueueListener(log_queue, file_handler)
+    queue_listener.start()
+    atexit.register(queue_listener.stop)
+
+    agent_logger = logging.getLogger(AGENT_LOGGER_NAME)
+    agent_logger.addHandler(QueueHandler(log_queue))
+    agent_logger.setLevel(LOG_LEVEL)
+    agent_logger.propagate = False
+
+    # Render JSON with orjson and route it through the queued stdlib handler
+    structlog.configure(
+        processors=[
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(serializer=lambda obj, **kwargs: orjson.dumps(obj, **kwargs).decode())
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
+        cache_logger_on_first_use=True,
+    )
 
-# Get logger with file handler
-logger = structlog.get_logger()
-logger.addHandler(file_handler)
-logger.setLevel(logging.INFO)
 
 MAX_RAW = 60
 TAIL_SIZE = 20
+# Bound for the per-run theorem and premise memo caches, least recently used entries are evicted first
+MEMO_CACHE_SIZE = 4096
+# Maximum number of in-flight theorem/premise lookups, to match the Coq server's worker pool
+MAX_CONCURRENT_COQ_REQUESTS = 16
+# check_proof responses are large, keep only the recent ones parsed
+CHECK_PROOF_CACHE_SIZE = 256
+# Similar proofs analyses kept for replay when a critique loop comes back to the same goals
+ANALYSIS_CACHE_SIZE = 64
+# Tools that change the proof state: they are only run once the executor message is complete
+SYNCHRONOUS_TOOLS = {"check_proof"}
+SCORE_FIELD_PATTERN = re.compile(r'"score"\s*:\s*"?(10|[1-9])\b')
+SCORE_PATTERN = re.compile(r'\b(10|[1-9])\b')
+SKIPPED_TOOL_CALL_MESSAGE = "This tool call was not executed: only one tool call per message is run. Call it again."
 
 
 class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqPilotGeneralMessageS2EContent]):
@@ -73,6 +141,8 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
       - Tool invocations via MCP server
 
     :cvar tools:             List of available BaseTool instances for Coq interaction.
+    :cvar session_tools:     Tools bound to each open Coq session by name, keyed by session ID.
+    :cvar session_clients:   MCP client shared by the tools of each open Coq session, keyed by session ID.
     :cvar executor:          ChatGrazie instance driving tactic execution.
     :cvar critic:            ChatGrazie instance for proof‐progress critique.
     :cvar replanner:         ChatGrazie instance for refining failing strategies.
@@ -82,8 +152,19 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
     :cvar similar_theorems_analyzer: ChatGrazie for mining analogous proofs.
     :cvar coq_project_client: CoqProjectClient managing Coq RPC sessions.
     :cvar config:            Parsed agent configuration from the system message.
+    :cvar executor_graph:    Compiled single-plan executor subgraph, shared by all plans.
+    :cvar execution_system_message: Executor system prompt for the target theorem, shared by all plans.
+    :cvar theorem_cache:     Memoized `get_theorem` responses by (file, theorem name, session, proof version).
+    :cvar premise_cache:     Memoized `get_premises` results by (goal, file, session).
+    :cvar check_proof_response_cache: Parsed `check_proof` responses by their raw content.
+    :cvar similar_proofs_analysis_cache: `fetch_similar` prompt and analysis by (session, proof version, goals),
+                             `None` if no similar theorems were found.
+    :cvar coq_request_semaphore: Bounds concurrent theorem/premise lookups against the Coq server.
+    :cvar compiled_graph:    High-level FSM, compiled on the first `run` and reused afterwards.
     """
     tools: List[BaseTool]
+    session_tools: Dict[str, Dict[str, BaseTool]]
+    session_clients: Dict[str, McpHttpClient]
     executor: ChatGrazie
     replanner: ChatGrazie
     critic: ChatGrazie
@@ -96,6 +177,15 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
     max_raw_messages_number: int
     tool_summary: str
     config: CoqPilotGeneralMessageE2SConfig
+    theorem_name: str
+    executor_graph: Callable
+    execution_system_message: SystemMessage
+    theorem_cache: "OrderedDict[Tuple[str, str, str, str], Dict[str, Any]]"
+    premise_cache: "OrderedDict[Tuple[str, str, str], List[str]]"
+    check_proof_response_cache: "OrderedDict[str, Dict[str, Any]]"
+    similar_proofs_analysis_cache: "OrderedDict[Tuple[str, str, bytes], Optional[Tuple[HumanMessage, BaseMessage]]]"
+    coq_request_semaphore: asyncio.Semaphore
+    compiled_graph: Optional[CompiledStateGraph] = None
 
     class CoqPilotGeneralState(TypedDict):
         """
@@ -117,11 +207,16 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             current_plan_index: Index of active plan
             coq_session_id: Coq project session ID
             plan_fix_is_needed: Flag for replanning necessity
-            current_goals: JSON-encoded current proof goals
+            current_goals: Current proof goals, as returned by `check_proof`
             source_target_file_path: Path to the Coq file
             failed_proof_checks: Consecutive failed proof verifications
             finished_proof: Completed proof script
             theorem_statement: Statement of target theorem
+            pending_tools: Tool calls dispatched while the executor was decoding, by tool call ID
+            progress_summary: Rolling summary of the summarized part of the current plan run
+            summarized_up_to_index: Number of leading messages already covered by `progress_summary`
+            similar_proofs_context: Similar theorems and theorem state prefetched during `critique`, if any
+            last_was_critic: Whether the critic has spoken since the last replan
         """
         messages: List[BaseMessage]
         proof_version_hash: str
@@ -138,11 +233,16 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         current_plan_index: int
         coq_session_id: str
         plan_fix_is_needed: bool
-        current_goals: str
+        current_goals: List[Any]
         source_target_file_path: str
         failed_proof_checks: int
         finished_proof: str
         theorem_statement: str
+        pending_tools: Dict[str, asyncio.Task]
+        progress_summary: str
+        summarized_up_to_index: int
+        similar_proofs_context: Optional[Tuple[List[str], Dict[str, Any]]]
+        last_was_critic: bool
 
     async def init(self, _: CoqPilotGeneralState):
         """
@@ -160,61 +260,77 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         logger.info(f"Config: {self.config}")
 
         theorem_name, file_path = map(lambda x: f"{x}", initial_message.message.split(" "))
+        self.theorem_name = theorem_name
 
         self.coq_project_client = CoqProjectClient(
             'http://localhost:8000/rest/document'
         )
-
-        start_session_response = self.coq_project_client.start_session(file_path, theorem_name)
-        coq_session_id = start_session_response['sessionId']
-        proof_hash = start_session_response['proofVersionHash']
-        logger.info(f"Started session with ID: {coq_session_id} and proof version hash: {proof_hash}")
-
-        mcp_client = McpHttpClient('http://localhost:3001/mcp', coq_session_id)
-        mcp_client.proof_version_hash = proof_hash  # Set initial proof version hash
-        session_theorem_response = self.coq_project_client.get_session_theorem(coq_session_id, proof_hash)
+        self.theorem_cache = OrderedDict()
+        self.premise_cache = OrderedDict()
+        self.check_proof_response_cache = OrderedDict()
+        self.similar_proofs_analysis_cache = OrderedDict()
+        self.coq_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_COQ_REQUESTS)
+
+        self.session_tools = {}
+        self.session_clients = {}
+        coq_session_id, proof_hash = await self.start_coq_session(file_path, theorem_name)
+        session_theorem_response = await self.coq_project_client.aget_session_theorem(coq_session_id, proof_hash)
         theorem_statement = session_theorem_response['theoremStatement']
 
-        logger.info("Dynamically obtaining tools from client")
-        self.tools = await self.get_tools(McpCoqToolProvider(mcp_client))
-        logger.info("Tools obtained")
+        self.tools = list(self.session_tools[coq_session_id].values())
         logger.info("Tools", tools=self.tools)
 
-        self.tool_summary = "\n".join(f"- {t.name}: {t.description}" for t in self.tools)
-
-        # Initialize LLMs with configs
-        self.executor = self.get_chat(self.config.proof_flow_config.executor_llm_config, self.tools)
-        self.critic = self.get_chat(self.config.proof_flow_config.proof_progress_critic_llm_config, self.tools)
-        self.plan_ranker = self.get_chat(self.config.planning_config.plan_ranker_llm_config, self.tools)
-        self.plan_failure_summarizer = self.get_chat(self.config.proof_flow_config.plan_failure_summarizer_llm_config,
-                                                     self.tools)
-        self.similar_theorems_analyzer = self.get_chat(
-            self.config.proof_flow_config.similar_theorems_analyzer_llm_config, self.tools)
-        self.replanner = self.get_chat(self.config.proof_flow_config.replanner_llm_config, self.tools)
-        self.proof_progress_summarizer = self.get_chat(self.config.proof_flow_config.summarizer_llm_config, self.tools)
+        self.tool_summary = summarize_tools(self.tools)
+
+        # Initialize LLMs with configs, concurrently as client setup may perform I/O
+        llm_configs = [
+            self.config.proof_flow_config.executor_llm_config,
+            self.config.proof_flow_config.proof_progress_critic_llm_config,
+            self.config.planning_config.plan_ranker_llm_config,
+            self.config.proof_flow_config.plan_failure_summarizer_llm_config,
+            self.config.proof_flow_config.similar_theorems_analyzer_llm_config,
+            self.config.proof_flow_config.replanner_llm_config,
+            self.config.proof_flow_config.summarizer_llm_config,
+        ]
+        (
+            self.executor,
+            self.critic,
+            self.plan_ranker,
+            self.plan_failure_summarizer,
+            self.similar_theorems_analyzer,
+            self.replanner,
+            self.proof_progress_summarizer,
+        ) = await asyncio.gather(*(asyncio.to_thread(self.get_chat, llm_config, self.tools)
+                                   for llm_config in llm_configs))
+
+        self.executor_graph = self.build_executor_subgraph()
+        self.execution_system_message = SystemMessage(
+            content=render_execution_prompt(theorem_name, file_path))
 
         # Generate plans based on planning mode
         plans_res = []
         if self.config.planning_config.mode == "mad":
-            plans_res = await asyncio.gather(*[
-                multi_agent_proof_debate(theorem_statement,
-                                         self.tools,
-                                         self.config.planning_config.mad_planning_config,
-                                         logger,
-                                         thread_id=f"p{i}")
-                for i in range(self.config.planning_config.plan_samples_number)
-            ])
+            plans_res = await run_debate_samples(theorem_statement,
+                                                 self.tools,
+                                                 self.config.planning_config.mad_planning_config,
+                                                 logger,
+                                                 self.config.planning_config.plan_samples_number)
         elif self.config.planning_config.mode == "simple":
+            simple_tools_summary = summarize_tools(self.tools, bold_names=True)
             plans_res = await asyncio.gather(*[
                 simple_plan_generation(theorem_statement,
                                        self.tools,
-                                       self.config.planning_config.simple_planning_config)
+                                       self.config.planning_config.simple_planning_config,
+                                       tools_summary=simple_tools_summary)
                 for _ in range(self.config.planning_config.plan_samples_number)
             ])
 
-        plans = [p['final_plan'] for p in plans_res]
+        # Identical samples, e.g. deterministic plans answered from the LLM cache, are ranked and executed once
+        plans = list(dict.fromkeys(p['final_plan'] for p in plans_res))
+        if len(plans) < len(plans_res):
+            logger.info("Collapsed duplicate plans", samples_number=len(plans_res), plans_number=len(plans))
         messages = [
-            SystemMessage(content=execution_system_prompt.format(theorem_name=theorem_name, file_path=file_path)),
+            self.execution_system_message,
             HumanMessage(
                 content=f"Theorem to prove: {theorem_statement} in file: {file_path}")
         ]
@@ -235,12 +351,47 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             'current_plan_index': 0,
             'coq_session_id': coq_session_id,
             "plan_fix_is_needed": False,
-            "current_goals": "",
+            "current_goals": [],
             "source_target_file_path": file_path,
             "failed_proof_checks": 0,
             "theorem_statement": theorem_statement,
+            "pending_tools": {},
+            "progress_summary": "",
+            "summarized_up_to_index": 0,
+            "similar_proofs_context": None,
+            "last_was_critic": False,
         }
 
+    async def start_coq_session(self, file_path: str, theorem_name: str,
+                                started_session_ids: Optional[List[str]] = None) -> tuple[str, str]:
+        """
+        Start a Coq session for the theorem and load a dedicated set of MCP tools bound to it.
+
+        Sessions are stateful on the server side, so every concurrently executed plan needs its own one.
+
+        :param file_path:            Path to the Coq file containing the theorem.
+        :param theorem_name:         Name of the theorem to prove.
+        :param started_session_ids:  Receives the session ID as soon as the session exists, so that the caller
+                                     can finish it even if this coroutine is cancelled while loading the tools.
+        :returns:                    Tuple of (coq_session_id, proof_version_hash).
+        """
+        start_session_response = await self.coq_project_client.astart_session(file_path, theorem_name)
+        coq_session_id = start_session_response['sessionId']
+        if started_session_ids is not None:
+            started_session_ids.append(coq_session_id)
+        proof_hash = start_session_response['proofVersionHash']
+        logger.info(f"Started session with ID: {coq_session_id} and proof version hash: {proof_hash}")
+
+        mcp_client = McpHttpClient('http://localhost:3001/mcp', coq_session_id)
+        mcp_client.proof_version_hash = proof_hash  # Set initial proof version hash
+        self.session_clients[coq_session_id] = mcp_client
+
+        logger.info("Dynamically obtaining tools from client", coq_session_id=coq_session_id)
+        tools = await self.get_tools(McpCoqToolProvider(mcp_client))
+        self.session_tools[coq_session_id] = {tool.name: tool for tool in tools}
+        logger.info("Tools obtained", coq_session_id=coq_session_id)
+        return coq_session_id, proof_hash
+
     async def score_plans(self, state: CoqPilotGeneralState):
         """
         Rate each generated strategy by invoking the plan_ranker LLM and select top candidates.
@@ -249,18 +400,22 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         :returns:          Updated state with `plan_scores` and `plans_to_try`.
         """
         scores: Dict[str, int] = {}
-        theorem_statement = \
-            self.coq_project_client.get_session_theorem(state['coq_session_id'], state['proof_version_hash'])[
-                'theoremStatement']
+        assert state.get('theorem_statement'), "theorem_statement must be set by init"
+        theorem_statement = state['theorem_statement']
         if len(state['plans']) == 1:
             state['plan_scores'] = {state['plans'][0]: 10}
             state['plans_to_try'] = [state['plans'][0]]
             logger.info("Only one plan, scoring it as 10")
             return state
+        if self.config.planning_config.best_plan_samples_number >= len(state['plans']):
+            # Every plan would be kept anyway, so the ranking is not worth the LLM calls
+            state['plan_scores'] = {plan: 5 for plan in state['plans']}
+            state['plans_to_try'] = list(state['plans'])
+            logger.info("All plans are kept, skipping plan ranking", plans_number=len(state['plans']))
+            return state
 
-        for plan in state['plans']:
-            logger.info("Rating plan", plan=plan)
-            prompt = [
+        prompts = [
+            [
                 SystemMessage(content=(
                     "You are a plan evaluator for Coq proof strategies."
                     " You will get a theorem and one candidate plan."
@@ -274,45 +429,139 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
                     "Respond with exactly: {{\"reason\":\"...\", \"score\":<1–10>}}"
                 ))
             ]
-            resp = await self.plan_ranker.ainvoke(prompt)
-            logger.info("Plan ranker response", resp=resp.content)
-            try:
-                scores[plan] = json.loads(resp.content)['score']
-            except json.JSONDecodeError:
+            for plan in state['plans']
+        ]
+
+        if LOG_PAYLOADS:
+            logger.info("Rating plans", plans=state['plans'])
+        # Rank all plans concurrently, there are at most `plan_samples_number` of them
+        responses = await asyncio.gather(*(self.plan_ranker.ainvoke(prompt) for prompt in prompts))
+
+        for plan, resp in zip(state['plans'], responses):
+            if LOG_PAYLOADS:
+                logger.info("Plan ranker response", plan=plan, resp=resp.content)
+            score = self.parse_plan_score(resp.content)
+            if score is None:
                 logger.info("No score found for plan", plan=plan)
-                scores[plan] = 5
+                score = 5
+            scores[plan] = score
         ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
         state['plan_scores'] = scores
         state['plans_to_try'] = [p for p, _ in ranked[:self.config.planning_config.best_plan_samples_number]]
         logger.info("Scored and ranked plans", plan_scores=scores)
         return state
 
+    @staticmethod
+    def parse_plan_score(content: Any) -> Optional[int]:
+        """
+        Extract the score from a plan_ranker response, salvaging it from malformed JSON when possible.
+
+        :param content:    Content of the plan_ranker response.
+        :returns:          Score from 1 to 10, or None if the response contains none or it is out of range.
+        """
+        if not isinstance(content, str):
+            return None
+        try:
+            score = int(orjson.loads(content)['score'])
+        except (ValueError, KeyError, TypeError):
+            match = SCORE_FIELD_PATTERN.search(content) or SCORE_PATTERN.search(content)
+            if not match:
+                return None
+            score = int(match.group(1))
+        return score if 1 <= score <= 10 else None
+
     async def plan_loop(self, state: CoqPilotGeneralState):
         """
-        Sequentially execute each top‐ranked strategy until one succeeds or all fail.
+        Speculatively execute the top‐ranked strategies concurrently and keep the first one that succeeds.
+
+        The first plan reuses the session started in `init`; every other plan gets a fresh Coq session,
+        as sessions are stateful. Remaining plans are cancelled as soon as one of them finishes the proof,
+        and their sessions are finished. A plan raising an error counts as failed, the others keep running.
 
         :param state:      State containing `plans_to_try` and other metadata.
-        :returns:          State marked `is_proof_finished=True` on success, or left false.
-        """
-        state['current_goals'] = json.dumps(
-            self.coq_project_client.check_proof("Proof.\nQed.", state['coq_session_id'], state['proof_version_hash'])[
-                'goals'])
-        for idx, plan in enumerate(state['plans_to_try']):
-            state['current_plan_index'] = idx
-            if idx + 1 > self.config.planning_config.best_plan_samples_number:
-                break
+        :returns:          State marked `is_proof_finished=True` on success, carrying the session and proof
+                           version hash of the winning plan, or left false.
+        """
+        initial_check = await self.coq_project_client.acheck_proof(
+            "Proof.\nQed.", state['coq_session_id'], state['proof_version_hash'])
+        state['current_goals'] = initial_check['goals']
+        plans = state['plans_to_try'][:self.config.planning_config.best_plan_samples_number]
+        extra_session_ids: List[str] = []
+        plan_session_ids: Dict[int, str] = {0: state['coq_session_id']}
+
+        async def try_plan(idx: int, plan: str):
+            plan_state = state.copy()
+            plan_state['current_plan_index'] = idx
+            if idx > 0:
+                coq_session_id, proof_hash = await self.start_coq_session(
+                    state['source_target_file_path'], self.theorem_name, extra_session_ids)
+                plan_session_ids[idx] = coq_session_id
+                plan_state['coq_session_id'] = coq_session_id
+                plan_state['proof_version_hash'] = proof_hash
             logger.info("Executing plan", index=idx, plan=plan)
-            success, history, finished_proof = await self.execute_single_plan(plan, state['summary'], state)
-            if success:
-                state['messages'] = history
-                state['is_proof_finished'] = True
-                state['finished_proof'] = finished_proof
-                return state
-            # summarize failure
-            state['summary'] = await self.summarize_plan_failure(history)
-            state['tool_calling_iterations'] = 0
-            logger.info("Plan failed, summary for next", summary=state['summary'])
+            return await self.execute_single_plan(plan, state['summary'], plan_state)
+
+        tasks = {asyncio.create_task(try_plan(idx, plan)): idx for idx, plan in enumerate(plans)}
+        pending = set(tasks)
+        failed_histories: Dict[int, List[BaseMessage]] = {}
+        plan_errors: Dict[int, str] = {}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    idx = tasks[task]
+                    try:
+                        success, history, finished_proof = task.result()
+                    except Exception as e:
+                        # Only this plan failed, it must not cancel the ones still running
+                        logger.warning("Plan raised an error", index=idx, error=repr(e))
+                        plan_errors[idx] = repr(e)
+                        continue
+                    if success:
+                        logger.info("Plan succeeded, cancelling the others", index=idx)
+                        coq_session_id = plan_session_ids[idx]
+                        if coq_session_id in extra_session_ids:
+                            # The winning session stays open, the state refers to it from now on
+                            extra_session_ids.remove(coq_session_id)
+                        state['coq_session_id'] = coq_session_id
+                        state['proof_version_hash'] = self.session_clients[coq_session_id].proof_version_hash
+                        state['current_plan_index'] = idx
+                        state['messages'] = history
+                        state['is_proof_finished'] = True
+                        state['finished_proof'] = finished_proof
+                        return state
+                    logger.info("Plan failed", index=idx)
+                    failed_histories[idx] = history
+        finally:
+            for task in pending:
+                task.cancel()
+            # Let the cancelled plans unwind before their sessions and clients are closed under them
+            await asyncio.gather(*pending, return_exceptions=True)
+            extra_clients = [
+                mcp_client for mcp_client in
+                (self.session_clients.pop(coq_session_id, None) for coq_session_id in extra_session_ids)
+                if mcp_client is not None
+            ]
+            for coq_session_id in extra_session_ids:
+                self.session_tools.pop(coq_session_id, None)
+            # A failed cleanup must not replace the outcome of the plans, e.g. lose a found proof
+            cleanup_results = await asyncio.gather(
+                *(self.coq_project_client.afinish_session(coq_session_id) for coq_session_id in extra_session_ids),
+                *(mcp_client.close() for mcp_client in extra_clients),
+                return_exceptions=True,
+            )
+            for result in cleanup_results:
+                if isinstance(result, BaseException):
+                    logger.warning("Failed to clean up a plan session", error=repr(result))
+
         # all plans tried without success
+        summaries = await asyncio.gather(*(
+            self.summarize_plan_failure(failed_histories[idx]) for idx in sorted(failed_histories)
+        ))
+        summaries += [f"- The plan could not be executed: {plan_errors[idx]}" for idx in sorted(plan_errors)]
+        state['summary'] = "\n\n".join(summaries)
+        state['tool_calling_iterations'] = 0
+        logger.info("All plans failed", summary=state['summary'])
         state['is_proof_finished'] = False
         return state
 
@@ -330,8 +579,9 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         has_error = response_data.get("error", False)
         if not is_success:
             if not has_error:
-                state["current_goals"] = json.dumps(response_data["goals"])
-                logger.info("current goals", state=state["current_goals"])
+                state["current_goals"] = response_data["goals"]
+                if LOG_PAYLOADS:
+                    logger.info("current goals", state=state["current_goals"])
                 return f"Unfortunately, the last proof you checked is not valid:\n{response_data['attemptedProof']}" + \
                        f"\nIt fails with the error: {response_data['message']}" + \
                        f"\nBut it has a valid prefix {response_data['validPrefix']}" + \
@@ -342,14 +592,14 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
 
         if is_success and response_data["message"] == "Proof is incomplete but valid so far":
             proof = response_data["proof"]
-            state['current_goals'] = json.dumps(response_data["goals"])
+            state['current_goals'] = response_data["goals"]
             return f"The proof you just checked has no errors but is incomplete:\n{proof}" + \
                    f"\nThe current goals are {response_data['goals']}" + \
                    f"\nPlease continue to prove the theorem taking the valid prefix into account", False, state
 
         if is_success and str(response_data["message"]).startswith("Your proof is incomplete but valid so far. It has the following goal at the depth"):
             proof = response_data["proof"]
-            state['current_goals'] = json.dumps(response_data["goals"])
+            state['current_goals'] = response_data["goals"]
             return f"The proof you just checked has no errors but is incomplete:\n{proof}" + \
                    f"\nYou have successfully proved the current branch but there are goals in another branch. {response_data['goals']}" + \
                    f"\nPlease continue to prove the theorem taking the valid prefix into account", False, state
@@ -369,8 +619,13 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         """
 
         sub_state = parent_state.copy()
+        sub_state["pending_tools"] = {}
+        sub_state["progress_summary"] = ""
+        sub_state["summarized_up_to_index"] = 0
+        sub_state["similar_proofs_context"] = None
+        sub_state["last_was_critic"] = False
         sub_state["messages"] = [
-            SystemMessage(content=execution_system_prompt),
+            self.execution_system_message,
             HumanMessage(
                 content=f"Theorem to prove: {parent_state['theorem_statement']} in file {parent_state['source_target_file_path']}"),
         ]
@@ -378,13 +633,17 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         if summary:
             sub_state['messages'].append(SystemMessage(content="Summary:\n" + summary +
                                                                "\nContinue theorem proving."))
+        similar_block = "\n\n".join(similar_proofs)
         sub_state['messages'].append(
             HumanMessage(content=f"You should prove the theorem. Here is the plan you should follow. Plan:\n{plan}.\n"
-                                 f"Here are the theorems whose proofs can be similar to the target proof:\n" + '\n\n'.join(
-                similar_proofs)))
-
-        executor_graph = self.build_executor_subgraph()
-        final = await executor_graph(sub_state)
+                                 f"Here are the theorems whose proofs can be similar to the target proof:\n{similar_block}"))
+
+        try:
+            final = await self.executor_graph(sub_state)
+        finally:
+            for task in sub_state["pending_tools"].values():
+                task.cancel()
+            await asyncio.gather(*sub_state["pending_tools"].values(), return_exceptions=True)
         return final['is_proof_finished'], final['messages'], final["finished_proof"]
 
     async def summarize_plan_failure(self, history: List[Any]) -> str:
@@ -418,22 +677,88 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         :param state:         Current agent state with messages & summary.
         :returns:             Updated state with the LLM's next message appended.
         """
+        # The history is updated in place: copying it on every call is quadratic over a plan run
         messages = state["messages"]
         summary = state["summary"]
 
-        context: List[BaseMessage] = []
         if summary:
-            context.append(
-                HumanMessage(content="Conversation summary so far:\n" + summary)
-            )
-        context.extend(messages)
-        next_message = await self.executor.ainvoke(context)
-        logger.info("Received next message from LLM", next_message=next_message)
+            messages.insert(0, HumanMessage(content="Conversation summary so far:\n" + summary))
+        if self.config.proof_flow_config.enable_async_tool_dispatch:
+            next_message = await self.stream_executor_message(messages, state)
+        else:
+            next_message = await self.executor.ainvoke(messages)
+        if LOG_PAYLOADS:
+            logger.info("Received next message from LLM", next_message=next_message)
 
-        state["messages"] = context + [next_message]
+        messages.append(next_message)
         state["summary"] = ""
         return state
 
+    async def stream_executor_message(self, context: List[BaseMessage], state: CoqPilotGeneralState) -> AIMessage:
+        """
+        Stream the executor's reply and dispatch each tool call as soon as it is fully generated,
+        so that tool round-trips overlap with the decoding of the rest of the message.
+
+        A tool call is complete once the model starts emitting the next one. Dispatched calls are stored
+        as tasks in `state['pending_tools']` by tool call ID and awaited in `do_call_tool`.
+        Tools in `SYNCHRONOUS_TOOLS` change the proof state and are never dispatched early.
+
+        :param context:       Messages to send to the executor.
+        :param state:         Current agent state, receives the dispatched tasks.
+        :returns:             The complete executor message.
+        """
+        tools = self.session_tools[state["coq_session_id"]]
+        pending_tools = state["pending_tools"]
+        max_dispatched = None if self.config.proof_flow_config.enable_parallel_tool_execution else 1
+
+        gathered = None
+        dispatched = 0
+        async for chunk in self.executor.astream(context):
+            gathered = chunk if gathered is None else gathered + chunk
+            tool_call_chunks = getattr(gathered, "tool_call_chunks", [])
+            complete = len(tool_call_chunks) - 1
+            if max_dispatched is not None:
+                complete = min(complete, max_dispatched)
+            while dispatched < complete:
+                tool_call_chunk = tool_call_chunks[dispatched]
+                dispatched += 1
+                if tool_call_chunk["name"] in SYNCHRONOUS_TOOLS or not tool_call_chunk["id"]:
+                    continue
+                try:
+                    tool_args = orjson.loads(tool_call_chunk["args"] or "{}")
+                except orjson.JSONDecodeError:
+                    continue
+                tool_call = {"name": tool_call_chunk["name"], "args": tool_args, "id": tool_call_chunk["id"],
+                             "type": "tool_call"}
+                logger.debug("Dispatching tool call while decoding", tool_name=tool_call["name"])
+                pending_tools[tool_call["id"]] = asyncio.create_task(self.run_tool_call(tool_call, tools))
+
+        if gathered is None:
+            raise ValueError("Executor returned an empty stream")
+        if isinstance(gathered, AIMessageChunk):
+            return message_chunk_to_message(gathered)
+        return gathered
+
+    @staticmethod
+    async def run_tool_call(tool_call: ToolCall, tools: Dict[str, BaseTool]) -> ToolMessage:
+        """
+        Execute a single tool call directly, reporting errors back to the LLM the same way `ToolNode` does.
+
+        :param tool_call:     Tool call taken from an AIMessage.
+        :param tools:         Tools bound to the Coq session of the current plan, by name.
+        :returns:             The tool's ToolMessage, with `status="error"` if the call failed.
+        """
+        tool = tools.get(tool_call["name"])
+        if tool is None:
+            content = INVALID_TOOL_NAME_ERROR_TEMPLATE.format(requested_tool=tool_call["name"],
+                                                              available_tools=", ".join(tools))
+            return ToolMessage(content=content, name=tool_call["name"], tool_call_id=tool_call["id"], status="error")
+        try:
+            return await tool.ainvoke(tool_call)
+        except Exception as e:
+            return ToolMessage(content=TOOL_CALL_ERROR_TEMPLATE.format(error=repr(e)), name=tool_call["name"],
+                               tool_call_id=tool_call["id"], status="error")
+
     def create_request_content(
             self, tool_name: str, tool_args: dict[str, ALLOWED_ARG_TYPES], metadata: Optional[Dict[str, Any]] = None
     ) -> S2EContentT:
@@ -454,9 +779,14 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
 
     async def do_call_tool(self, state: CoqPilotGeneralState):
         """
-        Execute the first pending tool call in the last AIMessage via MCP.
+        Execute the pending tool calls in the last AIMessage via MCP.
 
-        :param state:         Agent state whose last message contains a tool call.
+        Tool calls are dispatched concurrently, except those in `SYNCHRONOUS_TOOLS` which change the proof state:
+        they run one after the other, in order. Responses are appended in the original call order.
+        With `enable_parallel_tool_execution` disabled only the first tool call is executed, the others
+        get a response asking to repeat them. The message history is only ever appended to.
+
+        :param state:         Agent state whose last message contains tool calls.
         :returns:             New state updated with the tool's response messages.
         """
         messages = state["messages"]
@@ -467,56 +797,100 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         if not last_message.tool_calls:
             return state
 
-        tool_call = last_message.tool_calls[0]
-        tool_name = tool_call["name"]
-        tool_args = tool_call["args"]
-
-        logger.info("Calling tool", tool_name=tool_name, tool_args=tool_args)
+        tool_calls = last_message.tool_calls
+        skipped_tool_calls: List[ToolCall] = []
+        if not self.config.proof_flow_config.enable_parallel_tool_execution:
+            tool_calls, skipped_tool_calls = tool_calls[:1], tool_calls[1:]
 
-        single_tool_message = AIMessage(content="", tool_calls=[tool_call])
-        messages[-1] = single_tool_message
+        tools = self.session_tools[state["coq_session_id"]]
+        pending_tools = state["pending_tools"]
 
-        tool_node = ToolNode(self.tools, handle_tool_errors=True, messages_key="messages")
-        tool_message = await tool_node.ainvoke(state)
+        async def tool_result(tool_call: ToolCall) -> ToolMessage:
+            # Reuse the call dispatched while the executor was still decoding, if there is one
+            task = pending_tools.pop(tool_call["id"], None)
+            if task is not None:
+                return await task
+            return await self.run_tool_call(tool_call, tools)
 
-        logger.info("Tool response", response_type=type(tool_message).__name__, response=tool_message)
-
-        # Process tool responses
         unsuccessful_attempt = False
-        for msg in tool_message["messages"]:
-            if isinstance(msg, ToolMessage):
-                try:
-                    response_data = json.loads(msg.content)
-                    if tool_name == "check_proof":
-                        msg.content, unsuccessful_attempt, state = self.format_check_proof_response(response_data,
-                                                                                                    state)
-
-                        if unsuccessful_attempt:
-                            state["failed_proof_checks"] += 1
-                        else:
-                            state["failed_proof_checks"] = 0
-
-                        if (response_data.get("success") and
-                                not response_data.get("goals") and
-                                response_data.get("message") != "Proof is incomplete but valid so far"):
-                            state["is_proof_finished"] = True
-                            state["finished_proof"] = response_data.get("proof")
-                            logger.info("Proof completed successfully", proof=response_data.get("proof"))
-
-                        if "hash" in response_data:
-                            new_hash = response_data["hash"]
-                            if new_hash != state["proof_version_hash"]:
-                                state["proof_version_hash"] = new_hash
-                                for tool in self.tools:
-                                    if isinstance(tool, McpCoqTool):
-                                        tool._client.proof_version_hash = new_hash
-                except json.JSONDecodeError:
-                    pass
-
-        state["messages"].extend(tool_message["messages"])
-        tool_calling_iterations = state["tool_calling_iterations"] + len(tool_message["messages"])
-        logger.info("Tool calling iterations", current=tool_calling_iterations, max=20)
 
+        def process_check_proof(msg: ToolMessage) -> None:
+            # Only `check_proof` responses are interpreted, the other tools' output goes to the LLM as is
+            nonlocal unsuccessful_attempt, state
+            try:
+                response_data = self.parse_check_proof_response(msg.content)
+            except orjson.JSONDecodeError:
+                return
+            msg.content, check_failed, state = self.format_check_proof_response(response_data, state)
+            unsuccessful_attempt = unsuccessful_attempt or check_failed
+
+            if check_failed:
+                state["failed_proof_checks"] += 1
+            else:
+                state["failed_proof_checks"] = 0
+
+            if (response_data.get("success") and
+                    not response_data.get("goals") and
+                    response_data.get("message") != "Proof is incomplete but valid so far"):
+                state["is_proof_finished"] = True
+                state["finished_proof"] = response_data.get("proof")
+
+            if "hash" in response_data:
+                new_hash = response_data["hash"]
+                if new_hash != state["proof_version_hash"]:
+                    state["proof_version_hash"] = new_hash
+                    # All tools of the session read the hash from their shared client, including the next check
+                    self.session_clients[state["coq_session_id"]].proof_version_hash = new_hash
+
+        async def run_synchronous_tools(synchronous_calls: List[ToolCall]) -> List[ToolMessage]:
+            # Proof-state changing calls run one at a time, in order, each against the latest proof version
+            results = []
+            for tool_call in synchronous_calls:
+                msg = await tool_result(tool_call)
+                if isinstance(msg, ToolMessage) and tool_call["name"] == "check_proof":
+                    process_check_proof(msg)
+                results.append(msg)
+            return results
+
+        synchronous_indices = [i for i, tc in enumerate(tool_calls) if tc["name"] in SYNCHRONOUS_TOOLS]
+        other_indices = [i for i, tc in enumerate(tool_calls) if tc["name"] not in SYNCHRONOUS_TOOLS]
+        synchronous_messages, *other_messages = await asyncio.gather(
+            run_synchronous_tools([tool_calls[i] for i in synchronous_indices]),
+            *(tool_result(tool_calls[i]) for i in other_indices)
+        )
+        # Responses go back in the original call order
+        tool_messages: List[ToolMessage] = [None] * len(tool_calls)
+        for i, msg in zip(synchronous_indices + other_indices, [*synchronous_messages, *other_messages]):
+            tool_messages[i] = msg
+
+        if LOG_PAYLOADS:
+            logger.info("Tool response", response=tool_messages)
+
+        state["messages"].extend(tool_messages)
+        # Every tool call needs a response, so the skipped ones are answered instead of being cut from the AIMessage
+        state["messages"].extend(
+            ToolMessage(content=SKIPPED_TOOL_CALL_MESSAGE, name=tool_call["name"], tool_call_id=tool_call["id"],
+                        status="error")
+            for tool_call in skipped_tool_calls
+        )
+        tool_calling_iterations = state["tool_calling_iterations"] + len(tool_messages)
+
+        # A proof check in the message drives the critique, whatever tool was called after it
+        reported_call = next((tc for tc in reversed(tool_calls) if tc["name"] == "check_proof"), tool_calls[-1])
+        tool_name = reported_call["name"]
+        tool_args = reported_call["args"]
+
+        # A single record per tool run instead of one per event
+        tool_event = {
+            "tool_calls": [{"tool_name": tc["name"], "tool_args": tc["args"]} for tc in tool_calls],
+            "response_types": [type(msg).__name__ for msg in tool_messages],
+            "iterations": tool_calling_iterations,
+            "max_iterations": 20,
+            "proof_completed": state["is_proof_finished"],
+        }
+        if state["is_proof_finished"]:
+            tool_event["proof"] = state.get("finished_proof")
+        logger.info("tool_call", **tool_event)
         return {
             "messages": state["messages"],
             "proof_version_hash": state["proof_version_hash"],
@@ -525,25 +899,22 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             "tool_name": tool_name,
             "tool_args": tool_args,
             "last_tool": tool_name,
-            "summary": state.get("summary", ""),
-            "plans": state.get("plans", []),
-            "plan_scores": state.get("plan_scores", {}),
-            "plans_to_try": state.get("plans_to_try", []),
-            "current_plan_index": state.get("current_plan_index", 0),
-            "coq_session_id": state.get("coq_session_id", ""),
             "plan_fix_is_needed": unsuccessful_attempt,
-            "current_goals": state.get("current_goals", ""),
-            "failed_proof_checks": state.get("failed_proof_checks", 0),
+            "current_goals": state["current_goals"],
+            "failed_proof_checks": state["failed_proof_checks"],
             "finished_proof": state.get("finished_proof", ""),
-            "theorem_statement": state.get("theorem_statement", ""),
         }
 
     async def critique(self, state: CoqPilotGeneralState):
         """
        Invoke the critic LLM after repeated failures to highlight plan deviations and improvements.
 
+       The similar proofs context for the following `fetch_similar` step is fetched while the critic is thinking,
+       unless `fetch_similar` will replay an earlier analysis of the same goals.
+
        :param state:         State including last plan and tool summary.
-       :returns:             State with a "[Critic]: ..." message appended.
+       :returns:             State with a "[Critic]: ..." message appended, `last_was_critic` and
+                             `similar_proofs_context` set.
        """
         messages = state['messages']
         logger.info("Invoking critique agent", last_tool=state['last_tool'], hash=state['proof_version_hash'])
@@ -553,9 +924,17 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             "Here is the description of the tools:\n"
             f"{self.tool_summary}"
             "Do NOT CALL TOOLS."))]
-        crit_msg = await self.critic.ainvoke(messages + crit_prompt)
-        logger.info("Critic response received", critic_response=crit_msg.content)
+        if self.similar_proofs_key(state) in self.similar_proofs_analysis_cache:
+            crit_msg = await self.critic.ainvoke(messages + crit_prompt)
+        else:
+            crit_msg, state["similar_proofs_context"] = await asyncio.gather(
+                self.critic.ainvoke(messages + crit_prompt),
+                self.get_similar_proofs_context(state),
+            )
+        if LOG_PAYLOADS:
+            logger.info("Critic response received", critic_response=crit_msg.content)
         messages.append(AIMessage(content=f"[Critic]: {crit_msg.content}"))
+        state["last_was_critic"] = True
         return state
 
     async def replan(self, state: CoqPilotGeneralState):
@@ -577,6 +956,7 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             HumanMessage(content=f"I have refined the plan based on the current proof progress: {new_plan}\n"
                                  "Now continue with following this plan and calling tools"))
         state["failed_proof_checks"] = 0
+        state["last_was_critic"] = False
 
         return state
 
@@ -584,115 +964,243 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
         """
         Collapse long chat histories into a bullet-point summary, preserving the last TAIL_SIZE messages.
 
+        The summary is rolling: only messages added since the previous summary are sent to the summarizer,
+        together with the previous summary. The new summary replaces the summarized prefix as the first message.
+
         :param state:         Current state with potentially lengthy `state['messages']`.
-        :returns:             State with `state['summary']` updated and trimmed message list.
+        :returns:             State with `state['progress_summary']` updated and trimmed message list.
         """
         raw = state["messages"]
-        to_summarize = []
-
-        for msg in raw:
-            if len(to_summarize) < len(raw) - TAIL_SIZE:
-                to_summarize.append(msg)
-                continue
-            elif len(to_summarize) >= len(raw) - TAIL_SIZE:
-                last_msg = to_summarize[-1]
-                pre_last_msg = to_summarize[-2]
-                if not (isinstance(last_msg, ToolMessage) and pre_last_msg.type == 'tool_call'):
-                    to_summarize.append(msg)
-                else:
-                    break
-
-        remaining = raw[len(to_summarize):]
-
-        assert to_summarize + remaining == raw
-
-        prompt = [
-            HumanMessage(content=(
-                    "Please produce a concise bullet-point summary "
-                    "of the proof progress so far (4-5) bullet points:\n\n"
-                    + "\n".join(m.content for m in to_summarize) + "DO NOT CALL TOOLS."
-            ))
-        ]
-        logger.info("Summarizing conversation so far")
-        summary_msg = await self.proof_progress_summarizer.ainvoke(prompt)
+        cut = max(0, len(raw) - TAIL_SIZE)
+        # Never separate tool responses from the AI message that requested them
+        while cut < len(raw) and isinstance(raw[cut], ToolMessage):
+            cut += 1
+        new_slice, remaining = raw[state["summarized_up_to_index"]:cut], raw[cut:]
+        new_messages = "\n".join(m.content for m in new_slice if m.content)
+
+        prior_summary = state["progress_summary"]
+        if prior_summary:
+            prompt_text = (
+                f"Prior summary:\n{prior_summary}\n"
+                f"New messages:\n{new_messages}\n"
+                "Update the bullet-point summary of the proof progress so far (4-5) bullet points. "
+                "DO NOT CALL TOOLS."
+            )
+        else:
+            prompt_text = (
+                "Please produce a concise bullet-point summary "
+                "of the proof progress so far (4-5) bullet points:\n\n"
+                + new_messages + "DO NOT CALL TOOLS."
+            )
+        logger.info("Summarizing conversation so far", new_messages_number=len(new_slice))
+        summary_msg = await self.proof_progress_summarizer.ainvoke([HumanMessage(content=prompt_text)])
         new_summary = summary_msg.content
 
         # update state
-        state["summary"] = new_summary
-        state["messages"] = remaining
+        state["progress_summary"] = new_summary
+        state["messages"] = [HumanMessage(content="Conversation summary so far:\n" + new_summary)] + remaining
+        state["summarized_up_to_index"] = 1
 
         return state
 
-    async def get_complete_similar_theorems(self, state: CoqPilotGeneralState):
+    async def get_complete_similar_theorems(self, state: CoqPilotGeneralState, most_relevant_last: bool = False):
         """
         Fetch and return full statements+proofs of theorems whose premises match current goals.
 
-        :param state:         State with `state['current_goals']` JSON-encoded list of goals.
+        :param state:         State with `state['current_goals']` list of goals.
+        :param most_relevant_last: Return the theorems in reverse relevance order, closest to the prompt's end.
         :returns:             List of "statement\nproof" strings for each similar theorem.
         """
         logger.info("Getting similar proofs state")
-        goals = state["current_goals"]
-        goals_list = json.loads(goals)
-        logger.info("Current goals", goals=goals)
-
-        theorem_names = []
-        for goal in goals_list:
-            if isinstance(goal, str):
-                goal_json = goal
-            elif isinstance(goal, dict):
-                goal_json = json.dumps(goal)
-            else:
-                logger.warning(f"Unexpected goal type: {type(goal)}", goal=goal)
-                continue
-
-            premises = self.coq_project_client.get_premises(
-                goal_json,
-                state["source_target_file_path"],
-                state["coq_session_id"]
-            ).get("premises", [])
-            theorem_names.extend(premises)
-
-        complete_similar_theorems = []
-        for theorem_name in theorem_names:
-            complete_theorem = self.coq_project_client.get_theorem(
-                state["source_target_file_path"],
-                theorem_name,
-                state["coq_session_id"],
-                state["proof_version_hash"]
-            )
-            statement = complete_theorem.get("theoremStatement", "")
-            proof = complete_theorem.get("theoremProof", "")
-            complete_similar_theorems.append(statement + "\n" + proof)
+        goals_list = state["current_goals"]
+        if LOG_PAYLOADS:
+            logger.info("Current goals", goals=goals_list)
+        if not goals_list:
+            return []
+
+        # `check_proof` returns goals of a single kind, either pre-rendered strings or goal objects
+        if isinstance(goals_list[0], str):
+            goal_jsons = goals_list
+        else:
+            goal_jsons = [orjson.dumps(goal).decode() for goal in goals_list]
+
+        # Identical goals (e.g. symmetric subgoals) would race past the premise cache, ask for them only once
+        premises_lists = await asyncio.gather(*(
+            self.get_premises_cached(goal_json, state["source_target_file_path"], state["coq_session_id"])
+            for goal_json in dict.fromkeys(goal_jsons)
+        ))
+        # The same premise is often suggested for several goals, fetch it only once
+        theorem_names = list(dict.fromkeys(premise for premises in premises_lists for premise in premises))
+        if not theorem_names:
+            return []
+
+        complete_theorems = await self.get_theorems_cached(
+            state["source_target_file_path"],
+            theorem_names,
+            state["coq_session_id"],
+            state["proof_version_hash"]
+        )
+        if most_relevant_last:
+            complete_theorems.reverse()
+        complete_similar_theorems = [
+            complete_theorem.get("theoremStatement", "") + "\n" + complete_theorem.get("theoremProof", "")
+            for complete_theorem in complete_theorems
+        ]
 
         return complete_similar_theorems
 
-    async def get_similar_proofs_from_target_file(self, state: CoqPilotGeneralState):
+    def parse_check_proof_response(self, content: str) -> Dict[str, Any]:
         """
-        After a check_proof, gather analogous proofs and append them to `state['messages']`.
+        Parse a `check_proof` response, memoized by content: the executor often re-checks the same proof
+        (e.g. around critic loops), getting the very same goals back.
 
-        :param state:         State with updated `current_goals`.
-        :returns:             State with two new messages: the prompt and the LLM's response.
+        :param content:       Raw JSON text of the tool response.
+        :raises orjson.JSONDecodeError: If the response is not JSON.
+        :returns:             The parsed response. It is shared between hits and must not be mutated.
         """
-        complete_similar_theorems = await self.get_complete_similar_theorems(state)
+        if content in self.check_proof_response_cache:
+            self.check_proof_response_cache.move_to_end(content)
+            return self.check_proof_response_cache[content]
+        return self.remember(self.check_proof_response_cache, content, orjson.loads(content),
+                             CHECK_PROOF_CACHE_SIZE)
 
-        logger.info("Complete similar theorems", complete_similar_theorems=complete_similar_theorems)
+    @staticmethod
+    def remember(cache: OrderedDict, key: Any, value: Any, max_size: int = MEMO_CACHE_SIZE) -> Any:
+        """
+        Store `value` in an LRU memo cache, evicting the least recently used entry beyond `max_size`.
 
-        current_theorem_state = self.coq_project_client.get_session_theorem(
-            state["coq_session_id"],
-            state["proof_version_hash"]
+        :param cache:         Memo cache to update.
+        :param key:           Cache key.
+        :param value:         Value to store.
+        :param max_size:      Maximum number of entries kept.
+        :returns:             The stored value.
+        """
+        cache[key] = value
+        if len(cache) > max_size:
+            cache.popitem(last=False)
+        return value
+
+    async def get_theorems_cached(self, file_path: str, theorem_names: List[str], coq_session_id: str,
+                                  proof_version_hash: str) -> List[Dict[str, Any]]:
+        """
+        Fetch theorems memoized per run, as the same premises are suggested again and again across iterations.
+        The theorems missing from the cache are fetched together in a single bulk request.
+
+        :param file_path:     Path to the Coq file.
+        :param theorem_names: Names of the theorems to fetch.
+        :param coq_session_id: Coq project session ID.
+        :param proof_version_hash: Proof version the theorems are resolved against.
+        :returns:             Theorem responses with `theoremStatement` and `theoremProof`, in `theorem_names` order.
+        """
+        keys = [(file_path, theorem_name, coq_session_id, proof_version_hash) for theorem_name in theorem_names]
+        missing_names = [key[1] for key in keys if key not in self.theorem_cache]
+        if missing_names:
+            async with self.coq_request_semaphore:
+                theorems = await self.coq_project_client.aget_theorems_bulk(file_path, missing_names, coq_session_id,
+                                                                            proof_version_hash)
+            for theorem in theorems:
+                self.remember(self.theorem_cache, (file_path, theorem.get("theoremName"), coq_session_id,
+                                                   proof_version_hash), theorem)
+
+        complete_theorems = []
+        for key in keys:
+            theorem = self.theorem_cache.get(key)
+            if theorem is None:
+                # Not returned by the server (e.g. unknown session), formatted as an empty theorem
+                theorem = {}
+            else:
+                self.theorem_cache.move_to_end(key)
+            complete_theorems.append(theorem)
+        return complete_theorems
+
+    async def get_premises_cached(self, goal_json: str, file_path: str, coq_session_id: str) -> List[str]:
+        """
+        `get_premises` memoized per run, as the same goals recur across iterations and plans.
+
+        :param goal_json:     Goal, serialized as sent to the server.
+        :param file_path:     Path to the Coq file.
+        :param coq_session_id: Coq project session ID.
+        :returns:             Names of the premises suggested for the goal.
+        """
+        key = (goal_json, file_path, coq_session_id)
+        if key in self.premise_cache:
+            self.premise_cache.move_to_end(key)
+            return self.premise_cache[key]
+        async with self.coq_request_semaphore:
+            response = await self.coq_project_client.aget_premises(goal_json, file_path, coq_session_id)
+        return self.remember(self.premise_cache, key, response.get("premises", []))
+
+    async def get_similar_proofs_context(self, state: CoqPilotGeneralState) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Fetch the similar theorems and the current theorem state that `fetch_similar` shows to the analyzer.
+
+        :param state:         State with updated `current_goals`.
+        :returns:             Similar theorems (most relevant last) and the current session theorem,
+                              an empty theorem state if there are no goals to look up.
+        """
+        if not state["current_goals"]:
+            return [], {}
+        complete_similar_theorems, current_theorem_state = await asyncio.gather(
+            self.get_complete_similar_theorems(state, most_relevant_last=True),
+            self.coq_project_client.aget_session_theorem(state["coq_session_id"], state["proof_version_hash"]),
         )
+        return complete_similar_theorems, current_theorem_state
 
-        prompt = HumanMessage(content=(
-                f"The current theorem state is {current_theorem_state}\n"
-                + "List tactics, ideas, theorems and proof parts you can borrow to advance our proof."
-                + "(Do not call any tools.)"
-                + "Here are some similar proofs to the goal of after valid proof prefix:\n\n"
-                + "\n\n".join(reversed(complete_similar_theorems)) + "\n\n"
-        ))
+    @staticmethod
+    def similar_proofs_key(state: CoqPilotGeneralState) -> Tuple[str, str, bytes]:
+        """
+        Key of the similar proofs analysis: it only depends on the session, the proof version and the goals.
+
+        :param state:         Current agent state.
+        :returns:             (session ID, proof version hash, encoded goals).
+        """
+        return state["coq_session_id"], state["proof_version_hash"], orjson.dumps(state["current_goals"])
+
+    async def get_similar_proofs_from_target_file(self, state: CoqPilotGeneralState):
+        """
+        After a check_proof, gather analogous proofs and append them to `state['messages']`.
+
+        Critique/replan loops often come back here with unchanged goals: the analysis is then replayed
+        from `similar_proofs_analysis_cache` without fetching theorems or calling the analyzer again.
+
+        :param state:         State with updated `current_goals` and, possibly, a prefetched `similar_proofs_context`.
+        :returns:             State with two new messages: the prompt and the LLM's response,
+                              unchanged if no similar theorems were found.
+        """
+        similar_proofs_context = state.get("similar_proofs_context")
+        state["similar_proofs_context"] = None
+        key = self.similar_proofs_key(state)
+        if key in self.similar_proofs_analysis_cache:
+            self.similar_proofs_analysis_cache.move_to_end(key)
+            analysis = self.similar_proofs_analysis_cache[key]
+            logger.info("Replaying similar proofs analysis for unchanged goals", found=analysis is not None)
+            if analysis is not None:
+                state["messages"].extend(analysis)
+            return state
+        if similar_proofs_context is None:
+            similar_proofs_context = await self.get_similar_proofs_context(state)
+        complete_similar_theorems, current_theorem_state = similar_proofs_context
+
+        if LOG_PAYLOADS:
+            logger.info("Complete similar theorems", complete_similar_theorems=complete_similar_theorems)
+        if not complete_similar_theorems:
+            logger.info("No similar theorems found, skipping their analysis")
+            self.remember(self.similar_proofs_analysis_cache, key, None, ANALYSIS_CACHE_SIZE)
+            return state
+
+        prompt = HumanMessage(content="".join([
+            "The current theorem state is ", str(current_theorem_state), "\n",
+            "List tactics, ideas, theorems and proof parts you can borrow to advance our proof.",
+            "(Do not call any tools.)",
+            "Here are some similar proofs to the goal of after valid proof prefix:\n\n",
+            "\n\n".join(complete_similar_theorems), "\n\n",
+        ]))
         similar_proofs_msg = await self.similar_theorems_analyzer.ainvoke([prompt])
 
-        logger.info("Complete similar theorems response", similar_proofs_msg=similar_proofs_msg.content)
+        if LOG_PAYLOADS:
+            logger.info("Complete similar theorems response", similar_proofs_msg=similar_proofs_msg.content)
 
+        self.remember(self.similar_proofs_analysis_cache, key, (prompt, similar_proofs_msg), ANALYSIS_CACHE_SIZE)
         state["messages"].extend([prompt, similar_proofs_msg])
 
         return state
@@ -709,11 +1217,14 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             return 'early_stopping'
         if state['last_tool'] == 'check_proof' and state['failed_proof_checks'] >= 5:
             return 'critique'
-        if len(state["messages"]) > MAX_RAW:
+        messages = state["messages"]
+        if len(messages) > MAX_RAW:
             return "summarize"
-        if state['messages'] and state['messages'][-1].content.startswith('[Critic]'):
+        if state['last_was_critic']:
             return 'replan'
-        last = state['messages'][-1]
+        if not messages:
+            return 'call_llm'
+        last = messages[-1]
         if isinstance(last, AIMessage) and last.tool_calls:
             return 'call_tool'
         return 'call_llm'
@@ -812,12 +1323,14 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
 
     async def run(self):
         """
-       Entry point: compile the high-level FSM and invoke it from an empty initial state.
+       Entry point: compile the high-level FSM (once per agent) and invoke it from an empty initial state.
 
        :returns:             Final agent state after termination.
        """
-        graph = await self.get_graph()
-        compiled_graph = graph.compile()
+        init_logging()
+        if self.compiled_graph is None:
+            graph = await self.get_graph()
+            self.compiled_graph = graph.compile()
 
         initial_state = CoqPilotGeneralAgent.CoqPilotGeneralState(
             messages=[],
@@ -833,10 +1346,22 @@ class CoqPilotGeneralAgent(IdeFormerAgent[CoqPilotGeneralMessageE2SContent, CoqP
             plan_scores={},
             plans_to_try=[],
             current_plan_index=0,
-            current_goals="",
+            current_goals=[],
+            pending_tools={},
+            progress_summary="",
+            summarized_up_to_index=0,
+            similar_proofs_context=None,
+            last_was_critic=False,
         )
         logger.info("Starting agent")
-        final_state = await compiled_graph.ainvoke(initial_state, {"recursion_limit": 10000})
+        try:
+            final_state = await self.compiled_graph.ainvoke(initial_state, {"recursion_limit": 10000})
+        finally:
+            coq_project_client = getattr(self, "coq_project_client", None)
+            if coq_project_client is not None:
+                await coq_project_client.aclose()
+            for mcp_client in getattr(self, "session_clients", {}).values():
+                await mcp_client.close()
         logger.info("Agent finished")
         if isinstance(final_state, dict) and final_state.get("type") == "TERMINATION":
             final_state = final_state["content"]
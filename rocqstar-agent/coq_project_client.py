@@ -1,5 +1,15 @@
+from collections import OrderedDict
+
+import aiohttp
+import orjson
 import requests
-from typing import Any, Dict, Optional, List
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Optional, List, Tuple
+
+# Timeout, in seconds, for the synchronous requests
+REQUEST_TIMEOUT = 30
+# Session theorems kept per client, one per (session, proof version), least recently used ones are evicted first
+SESSION_THEOREM_CACHE_SIZE = 256
 
 
 class CoqProjectClient:
@@ -9,18 +19,53 @@ class CoqProjectClient:
         :param base_url: The base URL pointing to the Coq project server.
         """
         self.base_url = base_url.rstrip("/")
+        self._session_theorem_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._http: Optional[aiohttp.ClientSession] = None
+        # Pooled keep-alive connections for the synchronous methods
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
-    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _get(self, path: str, params: Optional[Any] = None) -> Dict[str, Any]:
         """
         Internal helper to perform a GET request.
         :param path: URL path to append to the base url.
-        :param params: Query parameters for the GET request.
+        :param params: Query parameters for the GET request, a dict or a list of pairs for repeated keys.
         :return: The JSON response as a dictionary.
         """
-        url = f"{self.base_url}{path}"
-        response = requests.get(url, params=params)
+        response = self._session.get(self.base_url + path, params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Lazily create the shared aiohttp session, so that keep-alive connections are reused across requests.
+        The session raises on error statuses itself, so callers need no per-response check.
+        :return: The open client session.
+        """
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(raise_for_status=True)
+        return self._http
+
+    async def _aget(self, path: str, params: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        Internal helper to perform a GET request without blocking the event loop.
+        :param path: URL path to append to the base url.
+        :param params: Query parameters for the GET request, a dict or a list of pairs for repeated keys.
+        :return: The JSON response as a dictionary.
+        """
+        http = await self._ensure_session()
+        async with http.get(f"{self.base_url}{path}", params=params) as response:
+            return orjson.loads(await response.read())
+
+    async def aclose(self) -> None:
+        """
+        Close the shared aiohttp session, if it was opened, and the pooled synchronous session.
+        """
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._session.close()
 
     def get_project_root(self) -> Dict[str, Any]:
         """
@@ -29,6 +74,13 @@ class CoqProjectClient:
         """
         return self._get("/")
 
+    async def aget_project_root(self) -> Dict[str, Any]:
+        """
+        Async version of `get_project_root`.
+        Path: GET /
+        """
+        return await self._aget("/")
+
     def get_theorem_names(self, file_path: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Retrieves theorem names from a specified file, optionally using a session's auxiliary file.
@@ -39,6 +91,16 @@ class CoqProjectClient:
             params["coqSessionId"] = session_id
         return self._get("/theorem-names", params=params)
 
+    async def aget_theorem_names(self, file_path: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async version of `get_theorem_names`.
+        Path: GET /theorem-names
+        """
+        params = {"filePath": file_path}
+        if session_id:
+            params["coqSessionId"] = session_id
+        return await self._aget("/theorem-names", params=params)
+
     def get_all_coq_files(self) -> Dict[str, Any]:
         """
         Returns a list of all Coq files in the project.
@@ -46,13 +108,59 @@ class CoqProjectClient:
         """
         return self._get("/all-coq-files")
 
+    async def aget_all_coq_files(self) -> Dict[str, Any]:
+        """
+        Async version of `get_all_coq_files`.
+        Path: GET /all-coq-files
+        """
+        return await self._aget("/all-coq-files")
+
     def get_session_theorem(self, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
         """
         Retrieves theorem information from a specific session and proof version.
+        The result is cached per (session, proof version), as a proof version never changes.
         Path: GET /session-theorem
         """
-        params = {"coqSessionId": session_id, "proofVersionHash": proof_version_hash}
-        return self._get("/session-theorem", params=params)
+        key = (session_id, proof_version_hash)
+        theorem = self._cached_session_theorem(key)
+        if theorem is None:
+            params = {"coqSessionId": session_id, "proofVersionHash": proof_version_hash}
+            theorem = self._cache_session_theorem(key, self._get("/session-theorem", params=params))
+        return theorem
+
+    async def aget_session_theorem(self, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
+        """
+        Async version of `get_session_theorem`, sharing its cache.
+        Path: GET /session-theorem
+        """
+        key = (session_id, proof_version_hash)
+        theorem = self._cached_session_theorem(key)
+        if theorem is None:
+            params = {"coqSessionId": session_id, "proofVersionHash": proof_version_hash}
+            theorem = self._cache_session_theorem(key, await self._aget("/session-theorem", params=params))
+        return theorem
+
+    def _cached_session_theorem(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached session theorem, marking it as recently used.
+        :param key: (session ID, proof version hash).
+        """
+        theorem = self._session_theorem_cache.get(key)
+        if theorem is not None:
+            self._session_theorem_cache.move_to_end(key)
+        return theorem
+
+    def _cache_session_theorem(self, key: Tuple[str, str], theorem: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Cache a session theorem, evicting the least recently used ones beyond SESSION_THEOREM_CACHE_SIZE.
+        :param key: (session ID, proof version hash).
+        :param theorem: Response of GET /session-theorem.
+        """
+        self._session_theorem_cache[key] = theorem
+        self._session_theorem_cache.move_to_end(key)
+        while len(self._session_theorem_cache) > SESSION_THEOREM_CACHE_SIZE:
+            self._session_theorem_cache.popitem(last=False)
+        return theorem
 
     def get_theorem(self, file_path: str, theorem_name: str, session_id: str, proof_version_hash: str) -> Dict[
         str, Any]:
@@ -64,6 +172,38 @@ class CoqProjectClient:
                   "proofVersionHash": proof_version_hash}
         return self._get("/theorem", params=params)
 
+    async def aget_theorem(self, file_path: str, theorem_name: str, session_id: str, proof_version_hash: str) -> Dict[
+        str, Any]:
+        """
+        Async version of `get_theorem`.
+        Path: GET /theorem
+        """
+        params = {"filePath": file_path, "theoremName": theorem_name, "coqSessionId": session_id,
+                  "proofVersionHash": proof_version_hash}
+        return await self._aget("/theorem", params=params)
+
+    def get_theorems_bulk(self, file_path: str, theorem_names: List[str], session_id: str,
+                          proof_version_hash: str) -> List[Dict[str, Any]]:
+        """
+        Retrieves several complete theorems with proofs from a source file in one request.
+        Each entry is shaped like the `get_theorem` response, with the `theoremName` it was requested for.
+        Path: GET /theorems
+        """
+        params = [("filePath", file_path), ("coqSessionId", session_id), ("proofVersionHash", proof_version_hash)]
+        params.extend(("theoremNames", theorem_name) for theorem_name in theorem_names)
+        return self._get("/theorems", params=params).get("theorems", [])
+
+    async def aget_theorems_bulk(self, file_path: str, theorem_names: List[str], session_id: str,
+                                 proof_version_hash: str) -> List[Dict[str, Any]]:
+        """
+        Async version of `get_theorems_bulk`.
+        Path: GET /theorems
+        """
+        params = [("filePath", file_path), ("coqSessionId", session_id), ("proofVersionHash", proof_version_hash)]
+        params.extend(("theoremNames", theorem_name) for theorem_name in theorem_names)
+        response = await self._aget("/theorems", params=params)
+        return response.get("theorems", [])
+
     def check_proof(self, proof: str, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
         """
         Validates a proof in the context of a session and returns goals/errors.
@@ -76,6 +216,18 @@ class CoqProjectClient:
         }
         return self._get("/check-proof", params=params)
 
+    async def acheck_proof(self, proof: str, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
+        """
+        Async version of `check_proof`.
+        Path: GET /check-proof
+        """
+        params = {
+            "proof": proof,
+            "coqSessionId": session_id,
+            "proofVersionHash": proof_version_hash
+        }
+        return await self._aget("/check-proof", params=params)
+
     def get_objects(self, session_id: str) -> Dict[str, Any]:
         """
         Gets objects in the current session.
@@ -84,6 +236,14 @@ class CoqProjectClient:
         params = {"coqSessionId": session_id}
         return self._get("/get-objects", params=params)
 
+    async def aget_objects(self, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `get_objects`.
+        Path: GET /get-objects
+        """
+        params = {"coqSessionId": session_id}
+        return await self._aget("/get-objects", params=params)
+
     def search_pattern(self, pattern: str, session_id: str) -> Dict[str, Any]:
         """
         Searches for a pattern in the current session.
@@ -92,6 +252,14 @@ class CoqProjectClient:
         params = {"pattern": pattern, "coqSessionId": session_id}
         return self._get("/search-pattern", params=params)
 
+    async def asearch_pattern(self, pattern: str, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `search_pattern`.
+        Path: GET /search-pattern
+        """
+        params = {"pattern": pattern, "coqSessionId": session_id}
+        return await self._aget("/search-pattern", params=params)
+
     def print_term(self, term: str, session_id: str) -> Dict[str, Any]:
         """
         Prints a term in the current session.
@@ -100,6 +268,14 @@ class CoqProjectClient:
         params = {"term": term, "coqSessionId": session_id}
         return self._get("/print-term", params=params)
 
+    async def aprint_term(self, term: str, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `print_term`.
+        Path: GET /print-term
+        """
+        params = {"term": term, "coqSessionId": session_id}
+        return await self._aget("/print-term", params=params)
+
     def check_term(self, term: str, session_id: str) -> Dict[str, Any]:
         """
         Checks a term in the current session.
@@ -108,6 +284,14 @@ class CoqProjectClient:
         params = {"term": term, "coqSessionId": session_id}
         return self._get("/check-term", params=params)
 
+    async def acheck_term(self, term: str, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `check_term`.
+        Path: GET /check-term
+        """
+        params = {"term": term, "coqSessionId": session_id}
+        return await self._aget("/check-term", params=params)
+
     def get_premises(self, goal: str, file_path: str, session_id: str, max_number_of_premises: int = 20) -> Dict[
         str, Any]:
         """
@@ -122,6 +306,20 @@ class CoqProjectClient:
         }
         return self._get("/get-premises", params=params)
 
+    async def aget_premises(self, goal: str, file_path: str, session_id: str, max_number_of_premises: int = 20) -> Dict[
+        str, Any]:
+        """
+        Async version of `get_premises`.
+        Path: GET /get-premises
+        """
+        params = {
+            "goal": goal,
+            "filePath": file_path,
+            "coqSessionId": session_id,
+            "maxNumberOfPremises": max_number_of_premises
+        }
+        return await self._aget("/get-premises", params=params)
+
     def start_session(self, file_path: str, theorem_name: str) -> Dict[str, Any]:
         """
         Initializes a new proof session for a theorem.
@@ -130,6 +328,14 @@ class CoqProjectClient:
         params = {"filePath": file_path, "theoremName": theorem_name}
         return self._get("/start-session", params=params)
 
+    async def astart_session(self, file_path: str, theorem_name: str) -> Dict[str, Any]:
+        """
+        Async version of `start_session`.
+        Path: GET /start-session
+        """
+        params = {"filePath": file_path, "theoremName": theorem_name}
+        return await self._aget("/start-session", params=params)
+
     def get_session(self, session_id: str) -> Dict[str, Any]:
         """
         Retrieves information about a specific session.
@@ -138,6 +344,14 @@ class CoqProjectClient:
         params = {"coqSessionId": session_id}
         return self._get("/get-session", params=params)
 
+    async def aget_session(self, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `get_session`.
+        Path: GET /get-session
+        """
+        params = {"coqSessionId": session_id}
+        return await self._aget("/get-session", params=params)
+
     def finish_session(self, session_id: str) -> Dict[str, Any]:
         """
         Closes a session and cleans up associated resources.
@@ -146,6 +360,14 @@ class CoqProjectClient:
         params = {"coqSessionId": session_id}
         return self._get("/finish-session", params=params)
 
+    async def afinish_session(self, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `finish_session`.
+        Path: GET /finish-session
+        """
+        params = {"coqSessionId": session_id}
+        return await self._aget("/finish-session", params=params)
+
     def get_proof_version_by_hash(self, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
         """
         Retrieves a specific proof version by its hash.
@@ -154,6 +376,14 @@ class CoqProjectClient:
         params = {"coqSessionId": session_id, "proofVersionHash": proof_version_hash}
         return self._get("/proof-version-by-hash", params=params)
 
+    async def aget_proof_version_by_hash(self, session_id: str, proof_version_hash: str) -> Dict[str, Any]:
+        """
+        Async version of `get_proof_version_by_hash`.
+        Path: GET /proof-version-by-hash
+        """
+        params = {"coqSessionId": session_id, "proofVersionHash": proof_version_hash}
+        return await self._aget("/proof-version-by-hash", params=params)
+
     def get_proof_history(self, session_id: str) -> Dict[str, Any]:
         """
         Returns the complete proof history tree for a session.
@@ -161,3 +391,11 @@ class CoqProjectClient:
         """
         params = {"coqSessionId": session_id}
         return self._get("/proof-history", params=params)
+
+    async def aget_proof_history(self, session_id: str) -> Dict[str, Any]:
+        """
+        Async version of `get_proof_history`.
+        Path: GET /proof-history
+        """
+        params = {"coqSessionId": session_id}
+        return await self._aget("/proof-history", params=params)
@@ -1,7 +1,8 @@
-import json
+import asyncio
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+import orjson
 
 
 class MCPServerError(Exception):
@@ -33,6 +34,58 @@ class McpHttpClient:
         self.proof_version_hash: Optional[str] = None
         self._id_counter = 0
         self.client_info = {"name": client_name, "version": client_version}
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._init_headers = {
+            "Accept": "application/json, text/event-stream",
+            "Content-Type": "application/json",
+        }
+        # Set once the MCP session is established
+        self._headers: Dict[str, str] = {}
+
+    async def __aenter__(self) -> "McpHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        Event loop the shared aiohttp session is bound to, None before the first request.
+
+        :returns: The session's event loop.
+        """
+        return self._loop
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """
+        Lazily create the aiohttp session shared by all requests, keeping connections to the server alive.
+        A session cannot be used outside its event loop, so a new one is created when called from another loop,
+        after closing the previous one.
+
+        :returns: The open client session.
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.closed or self._loop is not loop:
+            if self._http is not None and not self._http.closed:
+                try:
+                    await self._http.close()
+                except RuntimeError:
+                    # The session's event loop is closed already, its connections went away with it
+                    pass
+            self._http = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60))
+            self._loop = loop
+        return self._http
+
+    async def close(self) -> None:
+        """
+        Close the shared aiohttp session, if it was opened.
+
+        :returns: None
+        """
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
 
     async def _next_id(self) -> int:
         """
@@ -43,6 +96,28 @@ class McpHttpClient:
         self._id_counter += 1
         return self._id_counter
 
+    @staticmethod
+    async def _read_sse_message(resp: aiohttp.ClientResponse) -> Dict[str, Any]:
+        """
+        Read the first 'data:' event of an SSE response.
+
+        Lines are matched as raw bytes and the payload is parsed without decoding it to str first;
+        event/id lines and keep-alives are skipped. A payload with malformed UTF-8 is parsed again
+        with the invalid bytes dropped.
+
+        :param resp: Open SSE response.
+        :raises RuntimeError: If the SSE stream ends without a data line.
+        :returns: The decoded JSON-RPC message.
+        """
+        async for raw_line in resp.content:
+            if raw_line.startswith(b"data:"):
+                payload = raw_line[5:].strip()
+                try:
+                    return orjson.loads(payload)
+                except orjson.JSONDecodeError:
+                    return orjson.loads(payload.decode("utf-8", errors="ignore"))
+        raise RuntimeError("SSE ended without data")
+
     async def initialize(self) -> None:
         """
         Send the JSON-RPC 'initialize' method to the MCP server and capture the MCP‐Session‐Id.
@@ -61,17 +136,14 @@ class McpHttpClient:
             },
             "id": rid,
         }
-        headers = {
-            "Accept": "application/json, text/event-stream",
-            "Content-Type": "application/json",
-        }
-        async with aiohttp.ClientSession() as http:
-            async with http.post(self.url, json=payload, headers=headers) as resp:
-                resp.raise_for_status()
-                sid = resp.headers.get("mcp-session-id")
-                if not sid:
-                    raise RuntimeError("No MCP‑Session‑Id header in initialize response")
-                self.session_id = sid
+        http = await self._ensure_session()
+        async with http.post(self.url, data=orjson.dumps(payload), headers=self._init_headers) as resp:
+            resp.raise_for_status()
+            sid = resp.headers.get("mcp-session-id")
+            if not sid:
+                raise RuntimeError("No MCP‑Session‑Id header in initialize response")
+            self.session_id = sid
+            self._headers = {**self._init_headers, "mcp-session-id": sid}
 
     async def list_tools(self) -> List[Dict[str, Any]]:
         """
@@ -89,21 +161,11 @@ class McpHttpClient:
             "params": {},
             "id": rid,
         }
-        headers = {
-            "Accept": "application/json, text/event-stream",
-            "Content-Type": "application/json",
-            "mcp-session-id": self.session_id,
-        }
-        async with aiohttp.ClientSession() as http:
-            async with http.post(self.url, json=payload, headers=headers) as resp:
-                resp.raise_for_status()
-                async for raw_line in resp.content:
-                    line = raw_line.decode("utf-8", errors="ignore").strip()
-                    if line.startswith("data:"):
-                        payload = line[len("data:"):].strip()
-                        msg = json.loads(payload)
-                        return msg["result"]["tools"]
-        raise RuntimeError("SSE ended without data")
+        http = await self._ensure_session()
+        async with http.post(self.url, data=orjson.dumps(payload), headers=self._headers) as resp:
+            resp.raise_for_status()
+            msg = await self._read_sse_message(resp)
+        return msg["result"]["tools"]
 
     async def call_tool(self, tool_name: str, **kwargs: Any) -> str:
         """
@@ -126,7 +188,7 @@ class McpHttpClient:
             if isinstance(goal, str):
                 kwargs['goal'] = goal
             elif isinstance(goal, dict):
-                kwargs['goal'] = json.dumps(goal)
+                kwargs['goal'] = orjson.dumps(goal).decode()
             else:
                 raise ValueError(f"Goal must be string")
 
@@ -136,23 +198,13 @@ class McpHttpClient:
             "params": {"name": tool_name, "arguments": kwargs},
             "id": rid,
         }
-        headers = {
-            "Accept": "application/json, text/event-stream",
-            "Content-Type": "application/json",
-            "mcp-session-id": self.session_id,
-        }
-        async with aiohttp.ClientSession() as http:
-            async with http.post(self.url, json=payload, headers=headers) as resp:
-                resp.raise_for_status()
-                async for raw_line in resp.content:
-                    line = raw_line.decode("utf-8", errors="ignore").strip()
-                    if line.startswith("data:"):
-                        payload = line[len("data:"):].strip()
-                        msg = json.loads(payload)
-                        if 'error' in msg:
-                            raise MCPServerError(msg['error'])
-                        if "result" in msg and "hash" in msg["result"]:
-                            self.proof_version_hash = msg["result"]["hash"]
-                        # MCP returns a list of content chunks
-                        return msg["result"]["content"][0]["text"]
-        raise RuntimeError("SSE ended without data")
+        http = await self._ensure_session()
+        async with http.post(self.url, data=orjson.dumps(payload), headers=self._headers) as resp:
+            resp.raise_for_status()
+            msg = await self._read_sse_message(resp)
+        if 'error' in msg:
+            raise MCPServerError(msg['error'])
+        if "result" in msg and "hash" in msg["result"]:
+            self.proof_version_hash = msg["result"]["hash"]
+        # MCP returns a list of content chunks
+        return msg["result"]["content"][0]["text"]
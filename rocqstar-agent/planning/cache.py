@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import os
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple
+
+import orjson
+from ideformer.core.protocol.config.chat.grazie import GrazieConfig
+from langchain_core.messages import BaseMessage
+
+from grazie_langchain_utils.language_models.grazie import ChatGrazie
+
+# Lifetime, in seconds, of a cached completion
+LLM_CACHE_TTL = 3600
+# Set to e.g. redis://localhost:6379/0 to share the cache between agent processes
+REDIS_URL_ENV = "COQPILOT_AGENT_LLM_CACHE_REDIS_URL"
+
+
+class LLMCache(Protocol):
+    """Storage for LLM completions, keyed by `llm_cache_key`."""
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached completion.
+
+        :param key:  Cache key.
+        :returns:    The cached completion, or None on a miss.
+        """
+        ...
+
+    async def set(self, key: str, value: str, ttl: int = LLM_CACHE_TTL) -> None:
+        """
+        Store a completion.
+
+        :param key:    Cache key.
+        :param value:  Completion text.
+        :param ttl:    Lifetime of the entry, in seconds.
+        """
+        ...
+
+
+class InMemoryLRU:
+    """Process-local LLM cache evicting the least recently used entries beyond `maxsize`."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        :param maxsize:  Maximum number of completions kept.
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int = LLM_CACHE_TTL) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class RedisBackend:
+    """LLM cache stored in Redis, so that completions are shared between agent processes."""
+
+    def __init__(self, url: str, namespace: str = "coqpilot:llm:") -> None:
+        """
+        :param url:        Redis connection URL.
+        :param namespace:  Prefix of the Redis keys.
+        :raises ImportError: If the `redis` package is not installed.
+        """
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise ImportError("RedisBackend requires the `redis` package: pip install redis") from e
+        self._redis = redis.from_url(url)
+        self.namespace = namespace
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(self.namespace + key)
+        return value.decode() if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: int = LLM_CACHE_TTL) -> None:
+        await self._redis.set(self.namespace + key, value, ex=ttl)
+
+
+def create_llm_cache() -> LLMCache:
+    """
+    Create the LLM cache: Redis if `COQPILOT_AGENT_LLM_CACHE_REDIS_URL` is set, in-memory otherwise.
+
+    :returns:  The cache backend.
+    """
+    redis_url = os.environ.get(REDIS_URL_ENV)
+    if redis_url:
+        return RedisBackend(redis_url)
+    return InMemoryLRU()
+
+
+llm_cache: LLMCache = create_llm_cache()
+# Completions being computed by key, so that concurrent identical calls share one LLM round-trip
+_in_flight: Dict[str, "asyncio.Future[str]"] = {}
+
+_CLIENT_CACHE: Dict[Tuple[Any, ...], ChatGrazie] = {}
+
+
+def get_chat_client(config: GrazieConfig, with_temperature: bool = True) -> ChatGrazie:
+    """
+    Return the shared ChatGrazie client for `config`, creating it on first use,
+    so that consecutive planner calls reuse its connections instead of setting up a new client each time.
+
+    :param config:            LLM config of the client.
+    :param with_temperature:  Pass `config.temperature` to the client, otherwise the model default is used.
+    :returns:                 The client.
+    """
+    temperature = config.temperature if with_temperature else None
+    key = (config.grazie_jwt_token, config.client_auth_type, config.client_url, config.profile,
+           config.max_tokens_to_sample, temperature)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client_kwargs = {"temperature": temperature} if with_temperature else {}
+        client = _CLIENT_CACHE[key] = ChatGrazie(
+            grazie_jwt_token=config.grazie_jwt_token,
+            client_auth_type=config.client_auth_type,
+            client_url=config.client_url,
+            profile=config.profile,
+            max_tokens_to_sample=config.max_tokens_to_sample,
+            **client_kwargs
+        )
+    return client
+
+
+def canonical_text(text: str) -> str:
+    """
+    Canonical form of prompt text in cache keys: NFC normalized, without trailing whitespace on any line.
+
+    :param text:  Message content.
+    :returns:     The canonical text.
+    """
+    text = unicodedata.normalize("NFC", text)
+    return "\n".join(line.rstrip() for line in text.rstrip().split("\n"))
+
+
+def llm_cache_key(messages: List[BaseMessage], config: GrazieConfig) -> Optional[str]:
+    """
+    Build the exact-match cache key of an LLM call.
+
+    Only deterministic calls are cached, i.e. calls sent with an explicit temperature of 0: a call sampling
+    at a positive or the model's default temperature must give a fresh answer, e.g. for every plan sample.
+
+    :param messages:  Prompt messages.
+    :param config:    LLM config of the call, whose temperature is sent with it.
+    :returns:         SHA256 hex digest of the profile, canonical messages (see `canonical_text`)
+                      and token limit, or None if the call samples and must not be cached.
+    """
+    if config.temperature is None or config.temperature != 0:
+        return None
+    payload = orjson.dumps({
+        "profile": str(config.profile),
+        "messages": [
+            (m.type, canonical_text(m.content) if isinstance(m.content, str) else m.content) for m in messages
+        ],
+        "max_tokens": config.max_tokens_to_sample,
+    }, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+async def cached_completion(
+        messages: List[BaseMessage],
+        config: GrazieConfig,
+        complete: Callable[[List[BaseMessage]], Awaitable[str]]
+) -> str:
+    """
+    Return the cached completion of `messages`, calling `complete` and caching its result on a miss.
+    Sampling calls (see `llm_cache_key`) always call `complete`, the cache is not consulted for them.
+    Concurrent misses on the same key wait for the first one instead of each calling `complete`.
+
+    :param messages:  Prompt messages.
+    :param config:    LLM config of the call, whose temperature is sent by `complete`.
+    :param complete:  Performs the actual LLM call and returns the completion text.
+    :returns:         The completion text.
+    """
+    key = llm_cache_key(messages, config)
+    if key is None:
+        return await complete(messages)
+    cached = await llm_cache.get(key)
+    if cached is not None:
+        return cached
+
+    in_flight = _in_flight.get(key)
+    if in_flight is None:
+        async def complete_and_store() -> str:
+            content = await complete(messages)
+            await llm_cache.set(key, content, ttl=LLM_CACHE_TTL)
+            return content
+
+        in_flight = _in_flight[key] = asyncio.ensure_future(complete_and_store())
+        in_flight.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded, so that a cancelled caller does not cancel the completion the other callers wait for
+    return await asyncio.shield(in_flight)
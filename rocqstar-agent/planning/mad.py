@@ -1,5 +1,8 @@
-import json
-from typing import List, Dict, Any
+import asyncio
+import os
+from typing import List, Dict, Any, Tuple
+
+import orjson
 
 from ideformer.core.protocol.config.chat.grazie import GrazieConfig
 from langchain_core.messages import SystemMessage, AIMessage, BaseMessage
@@ -7,9 +10,46 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import StateGraph, END, MessagesState
 
-from grazie_langchain_utils.language_models.grazie import ChatGrazie
-from ..tools import McpCoqTool
+from ..tools import McpCoqTool, summarize_tools
 from ..protocol import MadPlanningConfig
+from .cache import get_chat_client
+
+
+# Debates are never resumed, so their checkpoints are only kept when this is set, e.g. to inspect them while debugging
+ENABLE_CHECKPOINT_ENV = "COQPILOT_AGENT_ENABLE_DEBATE_CHECKPOINT"
+
+# Messages seeding every debate transcript (debate topic and tools listing), always kept in debater prompts
+SEED_MESSAGES_NUMBER = 2
+
+# Prompt templates including tools_summary, built once as they only depend on the invoke inputs.
+# Content that is static within a debate (tools, role, theorem) comes first and the growing transcript last,
+# so that every round shares the longest possible prefix with the previous ones for provider-side prompt caching.
+TMPL_A = ChatPromptTemplate.from_messages([
+    ("system", "Available tools for proof planning:\n{tools_summary}"),
+    ("system",
+     "You are Debater A, a Coq expert. Use only natural language. Build on the tools above where helpful."),
+    ("system", "Theorem to prove:\n{theorem}"),
+    MessagesPlaceholder(variable_name="messages"),
+    ("user", "Outline your proof strategy this round, referencing tools if relevant.")
+])
+TMPL_B = ChatPromptTemplate.from_messages([
+    ("system", "Available tools for proof planning:\n{tools_summary}"),
+    ("system", "You are Debater B, a critical Coq theorist. Use natural language and tool references."),
+    ("system", "Theorem to prove:\n{theorem}"),
+    MessagesPlaceholder(variable_name="messages"),
+    ("user",
+     "Critique and refine Debater A's approach, suggesting tool-based improvements. Encounter critic fom Debater B.")
+])
+TMPL_J = ChatPromptTemplate.from_messages([
+    ("system", "Available tools for proof evaluation:\n{tools_summary}"),
+    ("system",
+     "You are the Judge: a neutral expert. Use natural language. RESPOND ONLY IN JSON FORMAT {{\"winner\": \"A\", \"plan\": \"...\"}}. DO NOT SENT ANYTHING ELSE."),
+    MessagesPlaceholder(variable_name="messages"),
+    ("user", (
+        "After reading all rounds, decide which plan is stronger ('A' or 'B') and provide a final consolidated proof plan."
+        "\n\nRespond only as JSON: {{\"winner\": \"A\", \"plan\": \"...\"}}."
+    ))
+])
 
 
 class MADState(MessagesState):
@@ -29,24 +69,111 @@ class MADState(MessagesState):
     tools_summary: str | None
 
 
-async def call_grazie(messages: List[BaseMessage], config: GrazieConfig) -> str:
+class JsonObjectScanner:
+    """
+    Incrementally locate the first complete JSON object of a text fed chunk by chunk,
+    tracking brace depth outside of string literals. Every character is scanned only once.
+    """
+
+    def __init__(self) -> None:
+        self.start = -1
+        self.end = -1
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scan the next chunk of the text.
+
+        :param chunk:  Text following the previously fed chunks.
+        :returns:      True once the object is complete, its bounds are then in `start` and `end`.
+        """
+        if self.end != -1:
+            return True
+        for char in chunk:
+            self._position += 1
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes in prose before the object do not open strings
+                self._in_string = self._depth > 0
+            elif char == "{":
+                if self._depth == 0:
+                    self.start = self._position - 1
+                self._depth += 1
+            elif char == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = self._position
+                    return True
+        return False
+
+
+def json_object_bounds(text: str) -> Tuple[int, int] | None:
+    """
+    Find the first complete JSON object in `text`.
+
+    :param text:  Text containing a JSON object, possibly surrounded by markdown fences or prose.
+    :returns:     (start, end) slice bounds of the object, or None if there is no complete object.
+    """
+    scanner = JsonObjectScanner()
+    return (scanner.start, scanner.end) if scanner.feed(text) else None
+
+
+def debate_window(messages: List[BaseMessage], window: int | None) -> List[BaseMessage]:
+    """
+    Bound the transcript sent to a debater to its seed messages and latest `window` turns.
+
+    :param messages:  Full debate transcript.
+    :param window:    Number of latest turns to keep, None to keep them all.
+    :returns:         Messages to pass to the debater prompt template.
+    """
+    if window is None or len(messages) <= SEED_MESSAGES_NUMBER + window:
+        return messages
+    latest_turns = messages[-window:] if window > 0 else []
+    return messages[:SEED_MESSAGES_NUMBER] + latest_turns
+
+
+async def call_grazie(
+        messages: List[BaseMessage],
+        config: GrazieConfig,
+        stop_after_json: bool = False
+) -> str:
     """
     Invoke a Grazie‐powered ChatGrazie model with a sequence of messages.
 
     :param messages:  List of `BaseMessage` (SystemMessage, HumanMessage, etc.) forming the prompt.
     :param config:    `GrazieConfig` containing JWT token, client URL, profile, and sampling settings.
+    :param stop_after_json: Stream the response and stop reading as soon as its first JSON object is complete,
+                      so that trailing tokens (closing fences, remarks) are not waited for.
+                      The content is then cut right after the object.
     :returns:         The generated content string from the LLM response.
     """
-    grazie_llm = ChatGrazie(
-        grazie_jwt_token=config.grazie_jwt_token,
-        client_auth_type=config.client_auth_type,
-        client_url=config.client_url,
-        profile=config.profile,
-        # temperature=config.temperature,
-        max_tokens_to_sample=config.max_tokens_to_sample
-    )
-    response = await grazie_llm.ainvoke(messages)
-    return response.content
+    # The debaters run with the model's default temperature
+    grazie_llm = get_chat_client(config, with_temperature=False)
+    if not stop_after_json:
+        response = await grazie_llm.ainvoke(messages)
+        return response.content
+
+    chunks = []
+    scanner = JsonObjectScanner()
+    stream = grazie_llm.astream(messages)
+    try:
+        async for chunk in stream:
+            chunks.append(chunk.content)
+            if scanner.feed(chunk.content):
+                break
+    finally:
+        await stream.aclose()
+    content = "".join(chunks)
+    return content[:scanner.end] if scanner.end != -1 else content
 
 
 async def multi_agent_proof_debate(
@@ -54,7 +181,8 @@ async def multi_agent_proof_debate(
         tools: List[McpCoqTool],
         config: MadPlanningConfig,
         logger,
-        thread_id: str = "coq_proof_debate"
+        thread_id: str = "coq_proof_debate",
+        tools_summary: str | None = None
 ) -> Dict[str, Any]:
     """
     Run a multi‐agent debate to generate and select a Coq proof strategy.
@@ -66,142 +194,106 @@ async def multi_agent_proof_debate(
     :param tools:      List of `McpCoqTool` instances available for planning.
     :param config:     `MadPlanningConfig` specifying number of rounds and LLM configs for A, B, and Judge.
     :param thread_id:  Optional identifier for checkpointing or tracing this debate.
+    :param tools_summary: Pre-built tools listing, built from `tools` if not given.
     :returns:          Dict with keys:
                       - `'transcript'`: `List[str]` of all debate messages in order.
                       - `'winner'`:      `'A'` or `'B'`, the chosen debater.
                       - `'final_plan'`:  `str`, the consolidated proof plan from the Judge.
     """
-    tools_summary = "\n".join(f"- {t.name}: {t.description}" for t in tools)
-
-    # Prompt templates including tools_summary
-    tmpl_A = ChatPromptTemplate.from_messages([
-        ("system", "Available tools for proof planning:\n{tools_summary}"),
-        ("system",
-         "You are Debater A, a Coq expert. Use only natural language. Build on the tools above where helpful."),
-        MessagesPlaceholder(variable_name="messages"),
-        ("user", (
-            "Theorem to prove:\n{theorem}\n\n"
-            "Outline your proof strategy this round, referencing tools if relevant."
-        ))
-    ])
-    tmpl_B = ChatPromptTemplate.from_messages([
-        ("system", "Available tools for proof planning:\n{tools_summary}"),
-        ("system", "You are Debater B, a critical Coq theorist. Use natural language and tool references."),
-        MessagesPlaceholder(variable_name="messages"),
-        ("user", (
-            "Theorem to prove:\n{theorem}\n\n"
-            "Critique and refine Debater A's approach, suggesting tool-based improvements. Encounter critic fom Debater B."
-        ))
-    ])
-    tmpl_J = ChatPromptTemplate.from_messages([
-        ("system", "Available tools for proof evaluation:\n{tools_summary}"),
-        ("system",
-         "You are the Judge: a neutral expert. Use natural language. RESPOND ONLY IN JSON FORMAT {{\"winner\": \"A\", \"plan\": \"...\"}}. DO NOT SENT ANYTHING ELSE."),
-        MessagesPlaceholder(variable_name="messages"),
-        ("user", (
-            "After reading all rounds, decide which plan is stronger ('A' or 'B') and provide a final consolidated proof plan."
-            "\n\nRespond only as JSON: {{\"winner\": \"A\", \"plan\": \"...\"}}."
-        ))
-    ])
+    if tools_summary is None:
+        tools_summary = summarize_tools(tools)
 
     # Node definitions
     def init_node(state):
         """
-        Initialize the debate state with the theorem, round counter, and seed message.
+        Initialize the debate state with the theorem, round counter, seed message and the tools listing.
 
-        :param state:  Mutable state dict to populate.
-        :returns:      Updated state with 'theorem', 'round', 'tools_summary', and initial 'messages'.
-        """
-        state['theorem'] = theorem
-        state['round'] = 0
-        state['tools_summary'] = tools_summary
-        state['messages'] = [SystemMessage(content=f"Proof debate on: {theorem}")]
-        print("Finished initializing node")
-        return state
+        The tools listing does not depend on any LLM call, so it is added here rather than in a separate
+        superstep before Debater A's first turn.
 
-    def gather_tools(state):
+        :param state:  Initial debate state.
+        :returns:      Update with 'theorem', 'round', 'tools_summary', and the initial 'messages'.
         """
-        Append an AIMessage listing available tools to the state messages.
-
-        :param state:  Current debate state.
-        :returns:      State with one additional AIMessage.
-        """
-        summary_msg = AIMessage(content=f"Tools available for planning:\n{state['tools_summary']}")
-        state["messages"].append(summary_msg)
-
-        return state
+        print("Finished initializing node")
+        return {
+            'theorem': theorem,
+            'round': 0,
+            'tools_summary': tools_summary,
+            'messages': [
+                SystemMessage(content=f"Proof debate on: {theorem}"),
+                AIMessage(content=f"Tools available for planning:\n{tools_summary}"),
+            ],
+        }
 
     async def node_A(state):
         """
         If under the round limit, generate Debater A's proposal via call_grazie.
 
         :param state:  Current debate state, including 'messages' and 'round'.
-        :returns:      State with Debater A's AIMessage appended.
+        :returns:      Update appending Debater A's AIMessage, empty past the round limit.
         """
-        if state['round'] < config.rounds_number:
-            msgs = state['messages']
-            prompt = tmpl_A.invoke({
-                'messages': msgs,
-                'theorem': state['theorem'],
-                'tools_summary': state['tools_summary']
-            }).to_messages()
-            reply = await call_grazie(prompt, config.pro_plan_llm_config)
-            logger.info(f"Pro said: {reply}")
-            state['messages'].append(AIMessage(content=reply))
-        return state
+        if state['round'] >= config.rounds_number:
+            return {}
+        msgs = debate_window(state['messages'], config.debate_window_messages)
+        prompt = TMPL_A.invoke({
+            'messages': msgs,
+            'theorem': state['theorem'],
+            'tools_summary': state['tools_summary']
+        }).to_messages()
+        reply = await call_grazie(prompt, config.pro_plan_llm_config)
+        logger.info(f"Pro said: {reply}")
+        return {'messages': [AIMessage(content=reply)]}
 
     async def node_B(state):
         """
         If under the round limit, generate Debater B's critique via call_grazie and increment round.
 
         :param state:  Current debate state.
-        :returns:      State with Debater B's AIMessage appended and 'round' incremented.
+        :returns:      Update appending Debater B's AIMessage and incrementing 'round', empty past the round limit.
         """
-        if state['round'] < config.rounds_number:
-            msgs = state['messages']
-            prompt = tmpl_B.invoke({
-                'messages': msgs,
-                'theorem': state['theorem'],
-                'tools_summary': state['tools_summary']
-            }).to_messages()
-            reply = await call_grazie(prompt, config.con_plan_llm_config)
-            logger.info(f"Con said: {reply}")
-            state['messages'].append(AIMessage(content=reply))
-            state['round'] += 1
-        return state
+        if state['round'] >= config.rounds_number:
+            return {}
+        msgs = debate_window(state['messages'], config.debate_window_messages)
+        prompt = TMPL_B.invoke({
+            'messages': msgs,
+            'theorem': state['theorem'],
+            'tools_summary': state['tools_summary']
+        }).to_messages()
+        reply = await call_grazie(prompt, config.con_plan_llm_config)
+        logger.info(f"Con said: {reply}")
+        return {'messages': [AIMessage(content=reply)], 'round': state['round'] + 1}
 
     async def node_J(state):
         """
         Generate the judge's verdict and final plan via call_grazie.
 
         :param state:  Current debate state containing all messages.
-        :returns:      State updated with 'winner' and 'final_plan' from JSON verdict.
+        :returns:      Update with 'winner' and 'final_plan' from JSON verdict.
         """
         msgs = state['messages']
-        prompt = tmpl_J.invoke({
+        prompt = TMPL_J.invoke({
             'messages': msgs,
             'tools_summary': state['tools_summary']
         }).to_messages()
-        raw = await call_grazie(prompt, config.judge_plan_llm_config)
+        raw = await call_grazie(prompt, config.judge_plan_llm_config, stop_after_json=True)
+        # The verdict may be wrapped in markdown fences or surrounded by text
+        bounds = json_object_bounds(raw)
         try:
-            verdict = json.loads(raw)
-        except json.JSONDecodeError:
+            verdict = orjson.loads(raw[bounds[0]:bounds[1]] if bounds else raw)
+        except orjson.JSONDecodeError:
+            logger.warning(f"Judge verdict is not valid JSON: {raw}")
             verdict = {"winner": "A", "plan": ""}
-        state['winner'] = verdict['winner']
-        state['final_plan'] = verdict['plan']
         logger.info(f'Judge verdict: {verdict}')
-        return state
+        return {'winner': verdict['winner'], 'final_plan': verdict['plan']}
 
     # Build graph
     builder = StateGraph(state_schema=MADState)
     builder.add_node('init', init_node)
-    builder.add_node('gather_tools', gather_tools)
     builder.add_node('debate_A', node_A)
     builder.add_node('debate_B', node_B)
     builder.add_node('judge', node_J)
     builder.set_entry_point('init')
-    builder.add_edge('init', 'gather_tools')
-    builder.add_edge('gather_tools', 'debate_A')
+    builder.add_edge('init', 'debate_A')
     builder.add_edge('debate_A', 'debate_B')
     builder.add_conditional_edges(
         'debate_B',
@@ -210,7 +302,8 @@ async def multi_agent_proof_debate(
     )
     builder.add_edge('judge', END)
 
-    app = builder.compile(checkpointer=MemorySaver())
+    checkpointer = MemorySaver() if os.environ.get(ENABLE_CHECKPOINT_ENV) else None
+    app = builder.compile(checkpointer=checkpointer)
 
     # Invoke
     init_state = {
@@ -226,3 +319,34 @@ async def multi_agent_proof_debate(
         'winner': result['winner'],
         'final_plan': result['final_plan']
     }
+
+
+async def run_debate_samples(
+        theorem: str,
+        tools: List[McpCoqTool],
+        config: MadPlanningConfig,
+        logger,
+        samples_number: int
+) -> List[Dict[str, Any]]:
+    """
+    Run `samples_number` independent debates concurrently, at most `config.max_concurrent_debates` at a time if set.
+
+    :param theorem:         The Coq theorem statement to prove.
+    :param tools:           List of `McpCoqTool` instances available for planning.
+    :param config:          `MadPlanningConfig` of the debates.
+    :param samples_number:  Number of debates, i.e. of sampled plans.
+    :returns:               Results of `multi_agent_proof_debate`, in sample order.
+    """
+    semaphore = asyncio.Semaphore(config.max_concurrent_debates) if config.max_concurrent_debates else None
+    tools_summary = summarize_tools(tools)
+
+    async def run_debate(sample_index: int) -> Dict[str, Any]:
+        # Every debate needs its own checkpoint thread, when checkpoints are enabled
+        debate = multi_agent_proof_debate(theorem, tools, config, logger, thread_id=f"debate-{sample_index}",
+                                          tools_summary=tools_summary)
+        if semaphore is None:
+            return await debate
+        async with semaphore:
+            return await debate
+
+    return list(await asyncio.gather(*(run_debate(i) for i in range(samples_number))))
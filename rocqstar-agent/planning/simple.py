@@ -1,15 +1,16 @@
-from typing import List
-from langchain_core.messages import SystemMessage, HumanMessage
+from typing import List, Optional
+from langchain_core.messages import SystemMessage, HumanMessage, BaseMessage
 
-from grazie_langchain_utils.language_models.grazie import ChatGrazie
-from ..tools import McpCoqTool
+from ..tools import McpCoqTool, summarize_tools
 from ..protocol import SimplePlanningConfig
+from .cache import cached_completion, get_chat_client
 
 
 async def simple_plan_generation(
         theorem: str,
         tools: List[McpCoqTool],
-        config: SimplePlanningConfig
+        config: SimplePlanningConfig,
+        tools_summary: Optional[str] = None
 ) -> str:
     """
     Generate a single-shot proof plan for `theorem` using simple planning config.
@@ -19,20 +20,18 @@ async def simple_plan_generation(
         grazie_api_key: Grazie API key
         tools: List of available tools
         config: Simple planning configuration
+        tools_summary: Pre-built markdown tools listing, built from `tools` if not given
         
     Returns:
         Generated proof plan as a string
     """
-    tools_summary = "\n".join(f"- **{t.name}**: {t.description}" for t in tools)
+    if tools_summary is None:
+        tools_summary = summarize_tools(tools, bold_names=True)
 
-    chat = ChatGrazie(
-        grazie_jwt_token=config.simple_plan_llm_config.grazie_jwt_token,
-        client_auth_type=config.simple_plan_llm_config.client_auth_type,
-        client_url=config.simple_plan_llm_config.client_url,
-        profile=config.simple_plan_llm_config.profile,
-        temperature=config.simple_plan_llm_config.temperature,
-        max_tokens_to_sample=config.simple_plan_llm_config.max_tokens_to_sample
-    )
+    async def complete(prompt: List[BaseMessage]) -> str:
+        chat = get_chat_client(config.simple_plan_llm_config)
+        response = await chat.ainvoke(prompt)
+        return response.content
 
     system = SystemMessage(content=(
         "You are a Coq expert assistant. "
@@ -46,5 +45,6 @@ async def simple_plan_generation(
         "Please output a numbered plan of tactics and tool calls."
     ))
 
-    response = await chat.ainvoke([system, human])
-    return response.content.strip()
+    # Deterministic (temperature 0) plans are answered from the LLM cache for an already seen theorem
+    content = await cached_completion([system, human], config.simple_plan_llm_config, complete)
+    return content.strip()
@@ -14,3 +14,18 @@ You are an expert Coq prover. Your mission is to produce a **correct**, **comple
 
 Begin now.
 """)
+
+# Literal pieces around the `{{theorem_name}}` and `{{file_path}}` placeholders, split once at import
+_EXECUTION_PROMPT_HEAD, _EXECUTION_PROMPT_REST = execution_system_prompt.split("{{theorem_name}}")
+_EXECUTION_PROMPT_MIDDLE, _EXECUTION_PROMPT_TAIL = _EXECUTION_PROMPT_REST.split("{{file_path}}")
+
+
+def render_execution_prompt(theorem_name: str, file_path: str) -> str:
+    """
+    Fill the placeholders of `execution_system_prompt`.
+
+    :param theorem_name:  Name of the theorem to prove.
+    :param file_path:     Path to the Coq file containing the theorem.
+    :returns:             The executor system prompt.
+    """
+    return _EXECUTION_PROMPT_HEAD + theorem_name + _EXECUTION_PROMPT_MIDDLE + file_path + _EXECUTION_PROMPT_TAIL
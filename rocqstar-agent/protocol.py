@@ -7,6 +7,9 @@ from ideformer.core.protocol.config.chat.grazie import GrazieConfig
 from ideformer.core.protocol.content import IdeFormerMessageE2SContent, IdeFormerMessageS2EContent
 from ideformer.core.protocol.types import ALLOWED_ARG_TYPES
 
+# Tool argument values passed through as is, besides None
+_PRIMITIVE_TYPES = (str, int, float, bool, Enum)
+
 
 class SimplePlanningConfig(BaseModel):
     simple_plan_llm_config: GrazieConfig = GrazieConfig()
@@ -17,6 +20,11 @@ class MadPlanningConfig(BaseModel):
     con_plan_llm_config: GrazieConfig = GrazieConfig()
     judge_plan_llm_config: GrazieConfig = GrazieConfig()
     rounds_number: int = 5
+    # Debater prompts keep only the latest turns of the transcript when set, the judge always reads all of it.
+    # Unbounded by default, as a sliding window defeats provider-side prompt caching of the transcript
+    debate_window_messages: int | None = None
+    # Debates run concurrently when sampling plans, set a bound only if the Grazie rate limit requires it
+    max_concurrent_debates: int | None = None
 
 
 class PlanningConfig(BaseModel):
@@ -37,6 +45,8 @@ class ProofFlowConfig(BaseModel):
     similar_theorems_analyzer_llm_config: GrazieConfig = GrazieConfig()
     max_tool_iterations_per_plan_number: int = 20
     max_raw_messages_number: int = 60
+    enable_parallel_tool_execution: bool = True
+    enable_async_tool_dispatch: bool = True
 
 
 class CoqPilotGeneralMessageE2SConfig(BaseModel, arbitrary_types_allowed=True):
@@ -54,14 +64,12 @@ class CoqPilotGeneralMessageS2EContent(IdeFormerMessageS2EContent):
 
     @classmethod
     def by_tool_call(cls, tool_name: str, tool_args: dict[str, ALLOWED_ARG_TYPES]):
+        primitive_types = _PRIMITIVE_TYPES
         validated_args = {}
         for key, value in tool_args.items():
-            if isinstance(value, (str, int, float, bool, Enum)) or value is None:
+            if value is None or isinstance(value, primitive_types):
                 validated_args[key] = value
             elif isinstance(value, list):
-                validated_args[key] = [
-                    v for v in value
-                    if isinstance(v, (str, int, float, bool, Enum)) or v is None
-                ]
+                validated_args[key] = [v for v in value if v is None or isinstance(v, primitive_types)]
 
         return cls(tool_name=tool_name, tool_args=validated_args)
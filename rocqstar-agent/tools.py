@@ -1,5 +1,6 @@
 import asyncio
-from typing import List, Any
+import functools
+from typing import Dict, Iterable, List, Any, Tuple
 
 from pydantic import PrivateAttr
 from langchain_core.tools import BaseTool
@@ -17,9 +18,8 @@ class McpCoqTool(BaseTool):
     and dispatches calls through an underlying McpHttpClient.
     """
     _client: McpHttpClient = PrivateAttr()
-    _requires_session_id: bool = PrivateAttr()
-    _requires_proof_version_hash: bool = PrivateAttr()
-    _arg_names: List[str] = PrivateAttr()
+    _arg_names: Tuple[str, ...] = PrivateAttr()
+    _injections: Tuple[Tuple[str, str], ...] = PrivateAttr()
 
     def __init__(self, name: str, description: str, client: McpHttpClient, requires_session_id: bool = True,
                  requires_proof_version_hash: bool = False, arg_names: List[str] = None):
@@ -33,21 +33,51 @@ class McpCoqTool(BaseTool):
         """
         super().__init__(name=name, description=description)
         self._client = client
-        self._requires_session_id = requires_session_id
-        self._requires_proof_version_hash = requires_proof_version_hash
-        self._arg_names = arg_names or []
+        self._arg_names = tuple(arg_names or ())
+        # (argument name, client attribute) of the IDs injected into every call
+        injections = []
+        if requires_session_id:
+            injections.append(("coqSessionId", "coq_session_id"))
+        if requires_proof_version_hash:
+            injections.append(("proofVersionHash", "proof_version_hash"))
+        self._injections = tuple(injections)
 
     def _run(self, *args: Any, **kwargs: Any) -> str:
         """
         Synchronous wrapper around the async `_arun` method.
 
+        When the client's event loop is running (e.g. LangChain runs the sync tool in a worker thread),
+        the call is submitted to it, so that its pooled MCP connections are reused. Otherwise it runs
+        in a fresh event loop, closing the client session it opened there before the loop goes away.
+
         :param args:   Positional arguments to pass to the tool.
         :param kwargs: Keyword arguments to pass to the tool.
+        :raises RuntimeError: If called from a coroutine running on the client's event loop, which would block it.
         :returns:       The raw text result returned by the MCP server.
         """
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(*args, **kwargs)
-        )
+        loop = self._client.loop
+        if loop is None or not loop.is_running():
+            return asyncio.run(self._arun_and_close(*args, **kwargs))
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            raise RuntimeError(f"Tool {self.name} cannot be run synchronously on its event loop, use `ainvoke`")
+        return asyncio.run_coroutine_threadsafe(self._arun(*args, **kwargs), loop).result()
+
+    async def _arun_and_close(self, *args: Any, **kwargs: Any) -> str:
+        """
+        Run `_arun`, then close the client session, which is bound to the current, short-lived event loop.
+
+        :param args:   Positional arguments to pass to the tool.
+        :param kwargs: Keyword arguments to pass to the tool.
+        :returns:       The raw text result returned by the MCP server.
+        """
+        try:
+            return await self._arun(*args, **kwargs)
+        finally:
+            await self._client.close()
 
     async def _arun(self, *args: Any, **kwargs: Any) -> str:
         """
@@ -57,24 +87,19 @@ class McpCoqTool(BaseTool):
         :param kwargs: Keyword arguments or nested dict/list in the `args` key.
         :returns:       Text response from the MCP server tool call.
         """
-        if 'args' in kwargs:
-            nested_args = kwargs.pop('args')
-            if isinstance(nested_args, list):
-                for i, arg in enumerate(nested_args):
-                    if i < len(self._arg_names):
-                        kwargs[self._arg_names[i]] = arg
-            elif isinstance(nested_args, dict):
+        nested_args = kwargs.pop('args', None)
+        if nested_args is not None:
+            if isinstance(nested_args, dict):
                 kwargs.update(nested_args)
+            elif isinstance(nested_args, list):
+                kwargs.update(zip(self._arg_names, nested_args))
 
         if args:
-            for i, arg in enumerate(args):
-                if i < len(self._arg_names):
-                    kwargs[self._arg_names[i]] = arg
+            kwargs.update(zip(self._arg_names, args))
 
-        if self._requires_session_id:
-            kwargs["coqSessionId"] = self._client.coq_session_id
-        if self._requires_proof_version_hash:
-            kwargs["proofVersionHash"] = self._client.proof_version_hash
+        client = self._client
+        for arg_name, attribute in self._injections:
+            kwargs[arg_name] = getattr(client, attribute)
 
         return await self._client.call_tool(self.name, **kwargs)
 
@@ -105,44 +130,87 @@ class McpCoqToolProvider(LangChainDynamicToolProvider):
         if not self._client.session_id:
             await self._client.initialize()
         tool_defs = await self._client.list_tools()
-        tools: List[BaseTool] = []
-        for td in tool_defs:
-            name = td["name"]
-            description = td.get("description", "")
-            input_schema = td.get("inputSchema", {})
-            if input_schema:
-                param_descriptions = []
-                input_schema_properties = input_schema.get("properties", {})
-                for param_name, param_info in input_schema_properties.items():
-                    is_required = False
-                    if param_name in ["coqSessionId", "proofVersionHash"]:
-                        continue
-                    if param_name in input_schema.get("required", []):
-                        is_required = True
-                    if isinstance(param_info, dict) and "description" in param_info:
-                        param_descriptions.append(f"{param_name}: {param_info['description']}." + (
-                            "This field is required." if is_required else ""))
-
-                if param_descriptions:
-                    description += f"\n\n# Parameters for the tool {name}:\n" + "\n".join(
-                        f"+ {desc}" for desc in param_descriptions)
-
-            requires_session_id = "coqSessionId" in td["inputSchema"].get("required", [])
-            requires_proof_version_hash = "proofVersionHash" in td["inputSchema"].get("required", [])
-
-            arg_names = [
-                name for name in td["inputSchema"].get("properties", {}).keys()
-                if name not in ["coqSessionId", "proofVersionHash"]
-            ]
-
-            tools.append(
-                McpCoqTool(
-                    name=name,
-                    description=description,
-                    client=self._client,
-                    requires_session_id=requires_session_id,
-                    requires_proof_version_hash=requires_proof_version_hash,
-                    arg_names=arg_names,
-                )
+        return [
+            McpCoqTool(
+                name=name,
+                description=description,
+                client=self._client,
+                requires_session_id=requires_session_id,
+                requires_proof_version_hash=requires_proof_version_hash,
+                arg_names=list(arg_names),
             )
-        return tools
+            for name, description, requires_session_id, requires_proof_version_hash, arg_names
+            in parse_tool_defs(tool_defs)
+        ]
+
+
+def parse_tool_defs(tool_defs: List[Dict[str, Any]]) -> List[Tuple[str, str, bool, bool, Tuple[str, ...]]]:
+    """
+    Turn MCP tool definitions into the arguments of their `McpCoqTool` wrappers.
+
+    Not memoized: it runs once per Coq session, next to a `tools/list` round-trip, and takes about 40 µs
+    for 15 tools, while a lookup keyed on the serialized definitions would still cost about 15 µs.
+
+    :param tool_defs:  Tool definitions of the `tools/list` result.
+    :returns:          (name, description, requires_session_id, requires_proof_version_hash, arg_names)
+                       for every tool.
+    """
+    specs = []
+    for td in tool_defs:
+        name = td["name"]
+        description = td.get("description", "")
+        input_schema = td.get("inputSchema", {})
+        if input_schema:
+            param_descriptions = []
+            input_schema_properties = input_schema.get("properties", {})
+            for param_name, param_info in input_schema_properties.items():
+                is_required = False
+                if param_name in ["coqSessionId", "proofVersionHash"]:
+                    continue
+                if param_name in input_schema.get("required", []):
+                    is_required = True
+                if isinstance(param_info, dict) and "description" in param_info:
+                    param_descriptions.append(f"{param_name}: {param_info['description']}." + (
+                        "This field is required." if is_required else ""))
+
+            if param_descriptions:
+                description += f"\n\n# Parameters for the tool {name}:\n" + "\n".join(
+                    f"+ {desc}" for desc in param_descriptions)
+
+        requires_session_id = "coqSessionId" in td["inputSchema"].get("required", [])
+        requires_proof_version_hash = "proofVersionHash" in td["inputSchema"].get("required", [])
+
+        arg_names = [
+            name for name in td["inputSchema"].get("properties", {}).keys()
+            if name not in ["coqSessionId", "proofVersionHash"]
+        ]
+
+        specs.append((name, description, requires_session_id, requires_proof_version_hash, tuple(arg_names)))
+    return specs
+
+
+@functools.lru_cache(maxsize=32)
+def build_tools_summary(tools_tuple: Tuple[Tuple[str, str], ...], bold_names: bool = False) -> str:
+    """
+    Render the tools listing shown in planner and executor prompts.
+
+    :param tools_tuple:  (name, description) of every tool.
+    :param bold_names:   Render the tool names in markdown bold.
+    :returns:            One "- name: description" line per tool.
+    """
+    if bold_names:
+        return "\n".join(f"- **{name}**: {description}" for name, description in tools_tuple)
+    return "\n".join(f"- {name}: {description}" for name, description in tools_tuple)
+
+
+def summarize_tools(tools: Iterable[BaseTool], bold_names: bool = False) -> str:
+    """
+    Tools listing of `tools`, see `build_tools_summary`.
+    Tools are listed by name, as the MCP server does not guarantee the order of `tools/list`,
+    so that the prompts embedding the listing stay identical across sessions.
+
+    :param tools:        Tools to list.
+    :param bold_names:   Render the tool names in markdown bold.
+    :returns:            The tools listing.
+    """
+    return build_tools_summary(tuple(sorted((t.name, t.description) for t in tools)), bold_names)
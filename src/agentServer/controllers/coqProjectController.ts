@@ -189,6 +189,69 @@ export class CoqProjectController {
         }
     }
 
+    /** Retrieves several complete theorems with proofs from a source file in one request.
+     * Returns one entry per requested name, in request order, shaped like the `/theorem` response.
+     */
+    @Get("/theorems")
+    @UseBefore(FilePathMiddleware)
+    async retrieveCompleteTheoremsFromFile(
+        @Required() @QueryParams("filePath") filePath: string,
+        @Required() @QueryParams("theoremNames", String) theoremNames: string[],
+        @Required() @QueryParams("coqSessionId") sessionId: string,
+        @Required() @QueryParams("proofVersionHash") proofVersionHash: string
+    ): Promise<any> {
+        const session = await this.sessionManager.getSession(sessionId);
+        if (!session) {
+            return { success: false, message: "Session not found" };
+        }
+
+        try {
+            const theorems =
+                await this.coqProjectObserverService.retrieveTheoremsWithProofFromFile(
+                    filePath,
+                    theoremNames
+                );
+
+            const isSessionFile = session.sourceFilePath === filePath;
+            const results = await Promise.all(
+                theoremNames.map(async (theoremName) => {
+                    if (isSessionFile && theoremName === session.theoremName) {
+                        return {
+                            theoremName: theoremName,
+                            ...(await this.retrieveTheoremFromSession(
+                                sessionId,
+                                proofVersionHash
+                            )),
+                        };
+                    }
+                    const theorem = theorems.get(theoremName);
+                    if (!theorem) {
+                        return {
+                            theoremName: theoremName,
+                            success: false,
+                            message: `Theorem ${theoremName} not found in file ${filePath}`,
+                        };
+                    }
+                    return {
+                        theoremName: theoremName,
+                        theoremStatement: theorem.statement,
+                        theoremProof: theorem.proof?.onlyText(),
+                        isIncomplete: theorem.proof?.is_incomplete,
+                        isFromOriginalFile: true,
+                    };
+                })
+            );
+
+            return { theorems: results };
+        } catch (error) {
+            return {
+                success: false,
+                message: "Failed to retrieve complete theorems",
+                error: error instanceof Error ? error.message : String(error),
+            };
+        }
+    }
+
     /** Validates a proof in the context of a session and returns goals/errors.
      * Checks if the proof is valid, complete, or has errors, and returns appropriate goals and error messages.
      * Also handles updating the proof version in the session.
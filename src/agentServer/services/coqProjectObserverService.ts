@@ -140,6 +140,40 @@ export class CoqProjectObserverService {
         return theorem;
     }
 
+    /**
+     * Retrieves several theorems with proofs from a file, parsing it only once.
+     * Theorems that are not found are omitted from the result.
+     */
+    async retrieveTheoremsWithProofFromFile(
+        filePath: string,
+        theoremNames: string[],
+        auxFileUri?: Uri
+    ): Promise<Map<string, Theorem>> {
+        console.log(
+            `retrieveTheoremsWithProofFromFile: Getting ${theoremNames.length} theorems from ${filePath}`
+        );
+
+        const fileUri = this.resolveFileUri(filePath, auxFileUri);
+
+        const document = await this.getDocument(fileUri);
+
+        const requestedNames = new Set(theoremNames);
+        const theorems = new Map<string, Theorem>();
+        for (const theorem of document) {
+            if (
+                requestedNames.has(theorem.name) &&
+                !theorems.has(theorem.name)
+            ) {
+                theorems.set(theorem.name, theorem);
+            }
+        }
+
+        console.log(
+            `retrieveTheoremsWithProofFromFile: Found ${theorems.size} of ${requestedNames.size} theorems`
+        );
+        return theorems;
+    }
+
     /**
      * Get all Coq files in the project
      */
@@ -79,6 +79,129 @@ suite("[AgentServer] RestAPI HTTP test", async () => {
             .query({ filePath: "small_document.v", theoremName: "not_exist" })
             .expect(400);
 
+        // GET /rest/document/theorems
+        // A session on another file, every theorem comes from small_document.v
+        response = await request
+            .get("/rest/document/start-session")
+            .query({ filePath: "test_parse_proof.v", theoremName: "test_1" })
+            .expect(200);
+        const otherSession = response.body;
+
+        // Several names are sent as a repeated query parameter
+        const theoremsQuery = (
+            sessionId: string,
+            proofVersionHash: string,
+            theoremNames: string[]
+        ) => {
+            const params = new URLSearchParams({
+                filePath: "small_document.v",
+                coqSessionId: sessionId,
+                proofVersionHash: proofVersionHash,
+            });
+            theoremNames.forEach((name) => params.append("theoremNames", name));
+            return params.toString();
+        };
+
+        response = await request
+            .get("/rest/document/theorems")
+            .query(
+                theoremsQuery(
+                    otherSession.sessionId,
+                    otherSession.proofVersionHash,
+                    ["test_thr", "test_thr1"]
+                )
+            )
+            .expect(200);
+
+        expect(response.body.theorems).not.toBeNullish();
+        expect(response.body.theorems.length).toEqual(2);
+        expect(response.body.theorems[0].theoremName).toEqual("test_thr");
+        expect(response.body.theorems[0].theoremStatement).toEqual(
+            "Theorem test_thr : forall n:nat, 0 + n = n."
+        );
+        expect(response.body.theorems[0].isFromOriginalFile).toEqual(true);
+        expect(response.body.theorems[1].theoremName).toEqual("test_thr1");
+        expect(response.body.theorems[1].theoremStatement).toEqual(
+            "Lemma test_thr1 : forall n:nat, 0 + n + 0 = n."
+        );
+        expect(response.body.theorems[1].isFromOriginalFile).toEqual(true);
+
+        // A single name is still coerced into a list
+        response = await request
+            .get("/rest/document/theorems")
+            .query({
+                filePath: "small_document.v",
+                theoremNames: "test_thr",
+                coqSessionId: otherSession.sessionId,
+                proofVersionHash: otherSession.proofVersionHash,
+            })
+            .expect(200);
+
+        expect(response.body.theorems.length).toEqual(1);
+        expect(response.body.theorems[0].theoremName).toEqual("test_thr");
+        expect(response.body.theorems[0].theoremStatement).toEqual(
+            "Theorem test_thr : forall n:nat, 0 + n = n."
+        );
+
+        // A missing theorem gets a failed entry, the others are still returned
+        response = await request
+            .get("/rest/document/theorems")
+            .query(
+                theoremsQuery(
+                    otherSession.sessionId,
+                    otherSession.proofVersionHash,
+                    ["not_exist", "test_thr"]
+                )
+            )
+            .expect(200);
+
+        expect(response.body.theorems.length).toEqual(2);
+        expect(response.body.theorems[0].theoremName).toEqual("not_exist");
+        expect(response.body.theorems[0].success).toEqual(false);
+        expect(response.body.theorems[0].theoremStatement).toBeNullish();
+        expect(response.body.theorems[1].theoremName).toEqual("test_thr");
+        expect(response.body.theorems[1].theoremStatement).toEqual(
+            "Theorem test_thr : forall n:nat, 0 + n = n."
+        );
+
+        // The session's own theorem comes from its current proof version
+        response = await request
+            .get("/rest/document/start-session")
+            .query({ filePath: "small_document.v", theoremName: "test_thr1" })
+            .expect(200);
+        const session = response.body;
+
+        response = await request
+            .get("/rest/document/theorems")
+            .query(
+                theoremsQuery(session.sessionId, session.proofVersionHash, [
+                    "test_thr",
+                    "test_thr1",
+                ])
+            )
+            .expect(200);
+
+        expect(response.body.theorems.length).toEqual(2);
+        expect(response.body.theorems[0].theoremName).toEqual("test_thr");
+        expect(response.body.theorems[0].isFromOriginalFile).toEqual(true);
+        expect(response.body.theorems[1].theoremName).toEqual("test_thr1");
+        expect(response.body.theorems[1].theoremStatement).toEqual(
+            "Lemma test_thr1 : forall n:nat, 0 + n + 0 = n."
+        );
+        expect(response.body.theorems[1].theoremProof).toEqual("");
+        expect(response.body.theorems[1].isIncomplete).toEqual(true);
+        expect(response.body.theorems[1].sessionId).toEqual(session.sessionId);
+        expect(response.body.theorems[1].isFromOriginalFile).toBeNullish();
+
+        await request
+            .get("/rest/document/finish-session")
+            .query({ coqSessionId: otherSession.sessionId })
+            .expect(200);
+        await request
+            .get("/rest/document/finish-session")
+            .query({ coqSessionId: session.sessionId })
+            .expect(200);
+
         await server.stop();
     });
 });